@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from .tts import tts_to_file
+from .tts import tts_batch
 
 LEVEL_NAMES = {
     "easy": "Easy",
@@ -28,23 +28,17 @@ def generate_episode_audio(episode: dict, out_dir="output/cache/audio"):
     files = []
 
     # Hook
-    hook_path = out_dir / "hook.wav"
-    tts_to_file(episode["hook"], hook_path)
-    files.append(("hook", hook_path))
+    files.append(("hook", out_dir / "hook.wav", episode["hook"]))
 
     # Questions
     for i, q in enumerate(episode["questions"], 1):
-        q_path = out_dir / f"q{i}.wav"
-        a_path = out_dir / f"a{i}.wav"
-
-        tts_to_file(build_question_text(i, q), q_path)
-        tts_to_file(build_answer_text(q), a_path)
-
-        files.extend([(f"q{i}", q_path), (f"a{i}", a_path)])
+        files.append((f"q{i}", out_dir / f"q{i}.wav", build_question_text(i, q)))
+        files.append((f"a{i}", out_dir / f"a{i}.wav", build_answer_text(q)))
 
     # Outro
-    outro_path = out_dir / "outro.wav"
-    tts_to_file(episode["outro"], outro_path)
-    files.append(("outro", outro_path))
+    files.append(("outro", out_dir / "outro.wav", episode["outro"]))
+
+    # one batch: clips are synthesized concurrently
+    tts_batch([(text, path) for _, path, text in files])
 
-    return files
+    return [(name, path) for name, path, _ in files]
@@ -1,57 +1,121 @@
-from pydub import AudioSegment
+import os
+import subprocess
+import wave
 from pathlib import Path
 
 QUESTION_TOTAL = 8000      # 8 seconds gameplay
 ANSWER_DURATION = 2500     # reveal time
 HOOK_DURATION = 2500
 OUTRO_DURATION = 5000
+LEAD_IN = 200
 
+# master track format: every clip is decoded straight into this
+SAMPLE_RATE = 44100
+CHANNELS = 1
+SAMPLE_WIDTH = 2  # s16le
+FRAME_BYTES = CHANNELS * SAMPLE_WIDTH
+BLOCK_BYTES = 64 * 1024
 
-def load(p):
-    return AudioSegment.from_file(p)
+_SILENCE = bytes(BLOCK_BYTES)
 
 
-def pad_to_duration(audio, target_ms):
-    if len(audio) >= target_ms:
-        return audio[:target_ms]
-    silence = AudioSegment.silent(duration=target_ms - len(audio))
-    return audio + silence
+def block_duration(name):
+    if name == "hook":
+        return HOOK_DURATION
+    if name.startswith("q"):
+        return QUESTION_TOTAL
+    if name.startswith("a"):
+        return ANSWER_DURATION
+    if name == "outro":
+        return OUTRO_DURATION
+    return None
 
 
-def build_timeline(audio_files, out_path="output/cache/master.wav"):
-    timeline = AudioSegment.silent(duration=200)
-    timestamps = []
+def ms_to_bytes(ms):
+    return (ms * SAMPLE_RATE // 1000) * FRAME_BYTES
+
+
+def write_silence(out, n_bytes):
+    while n_bytes > 0:
+        chunk = min(n_bytes, BLOCK_BYTES)
+        out.writeframesraw(_SILENCE[:chunk])
+        n_bytes -= chunk
 
-    def add_block(name, segment):
-        nonlocal timeline
-        start = len(timeline)
-        timeline += segment
-        end = len(timeline)
-        timestamps.append({"type": name, "start": start, "end": end})
 
-    for name, path in audio_files:
-        audio = load(path)
+def stream_clip(out, path, target_ms):
+    """
+    Decode `path` with ffmpeg and copy PCM blocks into `out`, truncated
+    or zero-padded to exactly target_ms. Only one block is in memory.
+    """
+    need = ms_to_bytes(target_ms)
 
-        if name == "hook":
-            audio = pad_to_duration(audio, HOOK_DURATION)
-            add_block(name, audio)
-            continue
+    proc = subprocess.Popen(
+        [
+            "ffmpeg", "-v", "error",
+            "-i", str(path),
+            "-f", "s16le",
+            "-ac", str(CHANNELS),
+            "-ar", str(SAMPLE_RATE),
+            "-",
+        ],
+        stdout=subprocess.PIPE,
+    )
 
-        if name.startswith("q"):
-            audio = pad_to_duration(audio, QUESTION_TOTAL)
-            add_block(name, audio)
-            continue
+    truncated = False
+    try:
+        while need > 0:
+            chunk = proc.stdout.read(min(BLOCK_BYTES, need))
+            if not chunk:
+                break
+            out.writeframesraw(chunk)
+            need -= len(chunk)
+        truncated = need == 0
+    finally:
+        proc.stdout.close()
+        if truncated and proc.poll() is None:
+            proc.kill()
+        code = proc.wait()
 
-        if name.startswith("a"):
-            audio = pad_to_duration(audio, ANSWER_DURATION)
-            add_block(name, audio)
-            continue
+    if code != 0 and not truncated:
+        raise subprocess.CalledProcessError(code, f"ffmpeg decode {path}")
 
-        if name == "outro":
-            audio = pad_to_duration(audio, OUTRO_DURATION)
-            add_block(name, audio)
+    write_silence(out, need)
 
+
+def build_timeline(audio_files, out_path="output/cache/master.wav"):
+    """
+    Stream every clip, padded/truncated to its slot, into the master WAV.
+    Linear time and constant memory in episode length.
+    """
     Path(out_path).parent.mkdir(parents=True, exist_ok=True)
-    timeline.export(out_path, format="wav")
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+
+    timestamps = []
+    position = LEAD_IN
+
+    try:
+        with wave.open(tmp_path, "wb") as out:
+            out.setnchannels(CHANNELS)
+            out.setsampwidth(SAMPLE_WIDTH)
+            out.setframerate(SAMPLE_RATE)
+
+            write_silence(out, ms_to_bytes(LEAD_IN))
+
+            for name, path in audio_files:
+                duration = block_duration(name)
+                if duration is None:
+                    continue
+
+                stream_clip(out, path, duration)
+                timestamps.append(
+                    {"type": name, "start": position, "end": position + duration}
+                )
+                position += duration
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    os.replace(tmp_path, out_path)
 
     return out_path, timestamps
@@ -1,23 +1,37 @@
 import asyncio
 from pathlib import Path
+from typing import Iterable, List, Tuple, Union
+
+from . import tts_cache
+from ..config import TTS_CONCURRENCY
 
 VOICE = "en-US-BrianNeural"
+EDGE_RATE = "+0%"
+
+OFFLINE_VOICE = "default"
+OFFLINE_RATE = 175
 
 
 # ---------------- EDGE TTS (ONLINE) ----------------
 async def _edge_generate(text: str, path: Path):
     import edge_tts
-    communicate = edge_tts.Communicate(text=text, voice=VOICE)
+    communicate = edge_tts.Communicate(text=text, voice=VOICE, rate=EDGE_RATE)
     await communicate.save(str(path))
 
 
-def _try_edge(text: str, path: Path):
-    try:
-        asyncio.run(_edge_generate(text, path))
-        return True
-    except Exception as e:
-        print("⚠️ Edge TTS failed — switching to offline voice")
-        return False
+async def _edge_batch(jobs: List[Tuple[str, Path]], limit: int) -> List[bool]:
+    sem = asyncio.Semaphore(max(1, limit))
+
+    async def one(text: str, path: Path) -> bool:
+        async with sem:
+            try:
+                await _edge_generate(text, path)
+                return True
+            except Exception as e:
+                print(f"⚠️ Edge TTS failed for {path.name} — switching to offline voice")
+                return False
+
+    return await asyncio.gather(*(one(text, path) for text, path in jobs))
 
 
 # ---------------- OFFLINE TTS ----------------
@@ -25,19 +39,55 @@ def _offline_generate(text: str, path: Path):
     import pyttsx3
 
     engine = pyttsx3.init()
-    engine.setProperty("rate", 175)
+    engine.setProperty("rate", OFFLINE_RATE)
     engine.save_to_file(text, str(path))
     engine.runAndWait()
 
 
+def edge_key(text: str) -> str:
+    return tts_cache.clip_key(text, VOICE, "edge", EDGE_RATE)
+
+
+def offline_key(text: str) -> str:
+    return tts_cache.clip_key(text, OFFLINE_VOICE, "pyttsx3", OFFLINE_RATE)
+
+
 # ---------------- PUBLIC API ----------------
-def tts_to_file(text: str, path: str):
-    path = Path(path)
-    path.parent.mkdir(parents=True, exist_ok=True)
+def tts_batch(
+    items: Iterable[Tuple[str, Union[str, Path]]], concurrency: int = TTS_CONCURRENCY
+):
+    """
+    Synthesize many clips at once: cache hits are copied, misses go to
+    edge-tts concurrently in one event loop, and any clip edge-tts
+    fails on falls back to the offline engine on its own.
+    """
+    pending = []
+    for text, path in items:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not tts_cache.fetch(edge_key(text), path):
+            pending.append((text, path))
+
+    if pending:
+        try:
+            results = asyncio.run(_edge_batch(pending, concurrency))
+        except Exception as e:
+            print("⚠️ Edge TTS unavailable — switching to offline voice")
+            results = [False] * len(pending)
+
+        for (text, path), ok in zip(pending, results):
+            if ok:
+                tts_cache.store(edge_key(text), path)
+                continue
 
-    # try online first
-    if _try_edge(text, path):
-        return
+            # fallback offline (cached, then synthesize)
+            if tts_cache.fetch(offline_key(text), path):
+                continue
+            _offline_generate(text, path)
+            tts_cache.store(offline_key(text), path)
 
-    # fallback offline
-    _offline_generate(text, path)
+    tts_cache.evict()
+
+
+def tts_to_file(text: str, path: str):
+    tts_batch([(text, path)])
@@ -0,0 +1,60 @@
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from ..config import CACHE_DIR, TTS_CACHE_MAX_MB
+from ..utils.cache import evict_lru, touch
+
+TTS_CACHE_DIR = Path(CACHE_DIR) / "tts"
+
+
+# =========================================================
+# CONTENT-ADDRESSED CLIP CACHE
+# A clip is identified by everything that affects its audio:
+# text, voice, engine and speaking rate. Hits are touched so
+# eviction drops the least recently used clips first.
+# =========================================================
+def clip_key(text: str, voice: str, engine: str, rate) -> str:
+    raw = "\x1f".join([engine, voice, str(rate), text])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def clip_path(key: str) -> Path:
+    return TTS_CACHE_DIR / key[:2] / f"{key}.audio"
+
+
+def lookup(key: str) -> Optional[Path]:
+    path = clip_path(key)
+    return path if touch(path) else None
+
+
+def store(key: str, src: Path) -> Optional[Path]:
+    src = Path(src)
+    if not src.is_file() or src.stat().st_size == 0:
+        return None
+
+    dst = clip_path(key)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f"{dst.name}.{os.getpid()}.tmp")
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+    return dst
+
+
+def fetch(key: str, dst: Path) -> bool:
+    """
+    Copy a cached clip to `dst`. Copy, not link: callers overwrite
+    their fixed output names in place on the next episode.
+    """
+    hit = lookup(key)
+    if not hit:
+        return False
+    Path(dst).parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(hit, dst)
+    return True
+
+
+def evict(max_bytes: int = TTS_CACHE_MAX_MB * 1024 * 1024):
+    evict_lru(TTS_CACHE_DIR, max_bytes, suffix=".audio")
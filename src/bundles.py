@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .config import CACHE_DIR
+from .question_bank import question_id
+
+BUNDLE_DIR = Path(CACHE_DIR) / "bundles"
+BUNDLE_VERSION = "2"  # bump when bundle contents change
+
+# key -> (file mtime, bundle); only hits are kept, so bundles written
+# later by `prepare` are picked up by long-running processes
+_loaded: Dict[str, Tuple[int, dict]] = {}
+
+
+# =========================================================
+# QUESTION BUNDLES
+# Everything derived from one question (layout, sprite keys,
+# narration clips, durations), written by `python -m
+# src.prepare`. A bundle is valid only for the exact question
+# content and layout settings (wrap, fit, fonts) it was built from.
+# =========================================================
+def bundle_key(q: dict) -> str:
+    # renderer imports this module; import its layout settings lazily
+    from .renderer.quiz_renderer import layout_inputs
+
+    content = {k: v for k, v in q.items() if k != "id" and not k.startswith("_")}
+    raw = json.dumps(
+        [BUNDLE_VERSION, layout_inputs(), content], sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def bundle_path(q: dict) -> Path:
+    return BUNDLE_DIR / f"{question_id(q)}.json"
+
+
+def load_bundle(q: dict) -> Optional[dict]:
+    key = bundle_key(q)
+    path = bundle_path(q)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    cached = _loaded.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        bundle = json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+    if bundle.get("key") != key:
+        return None
+
+    _loaded[key] = (mtime, bundle)
+    return bundle
+
+
+def save_bundle(q: dict, bundle: dict):
+    bundle["key"] = bundle_key(q)
+    path = bundle_path(q)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(bundle, indent=2, ensure_ascii=False))
+    os.replace(tmp, path)
+    _loaded[bundle["key"]] = (path.stat().st_mtime_ns, bundle)
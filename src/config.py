@@ -7,12 +7,24 @@ UPLOAD_EVERY_HOURS = int(os.getenv("UPLOAD_EVERY_HOURS", "18"))
 COMMENT_DELAY_HOURS = int(os.getenv("COMMENT_DELAY_HOURS", "24"))
 
 MONGO_URI = os.getenv("MONGO_URI", "")
+MONGO_DB = os.getenv("MONGO_DB", "quiz")
+
+# question backend: json | sqlite | mongo
+QUESTION_STORE = os.getenv("QUESTION_STORE", "json").lower()
+QUESTION_DB = os.getenv("QUESTION_DB", "data/questions.db")
+QUESTION_COOLDOWN_DAYS = float(os.getenv("QUESTION_COOLDOWN_DAYS", "60"))
 
 YOUTUBE_CLIENT_ID = os.getenv("YOUTUBE_CLIENT_ID", "")
 YOUTUBE_CLIENT_SECRET = os.getenv("YOUTUBE_CLIENT_SECRET", "")
 YOUTUBE_REDIRECT_URI = os.getenv("YOUTUBE_REDIRECT_URI", "")
 YOUTUBE_REFRESH_TOKEN = os.getenv("YOUTUBE_REFRESH_TOKEN", "")
 YOUTUBE_CHANNEL_ID = os.getenv("YOUTUBE_CHANNEL_ID", "")
+YOUTUBE_UPLOAD_URL = os.getenv(
+    "YOUTUBE_UPLOAD_URL",
+    "https://www.googleapis.com/upload/youtube/v3/videos"
+    "?uploadType=resumable&part=snippet,status",
+)
+UPLOAD_CHUNK_MB = float(os.getenv("UPLOAD_CHUNK_MB", "8"))  # rounded to 256 KiB
 META_PAGE_ID = os.getenv("META_PAGE_ID", "")
 META_PAGE_ACCESS_TOKEN = os.getenv("META_PAGE_ACCESS_TOKEN", "")
 
@@ -28,6 +40,36 @@ MUSIC_DIR = os.path.join(ASSETS_DIR, "music")
 DRY_RUN = os.getenv("DRY_RUN", "false").lower() in ("1", "true", "yes", "on")
 CACHE_DIR = os.getenv("CACHE_DIR", "output/cache")
 LOG_DIR = os.getenv("LOG_DIR", "output/logs")
+RUNS_DIR = os.getenv("RUNS_DIR", "output/runs")
+STATE_DB = os.getenv("STATE_DB", "output/state.db")
+TTS_CACHE_MAX_MB = int(os.getenv("TTS_CACHE_MAX_MB", "512"))
+TTS_CONCURRENCY = int(os.getenv("TTS_CONCURRENCY", "4"))
+
+# scheduler: keep this many rendered episodes ahead of the upload cadence
+RENDER_AHEAD = int(os.getenv("RENDER_AHEAD", "2"))
+SCHEDULER_POLL_SECONDS = int(os.getenv("SCHEDULER_POLL_SECONDS", "60"))
+RENDER_MAX_ATTEMPTS = int(os.getenv("RENDER_MAX_ATTEMPTS", "3"))  # per episode
+
+# delayed post-upload jobs (answers comment, ...)
+JOB_POLL_SECONDS = int(os.getenv("JOB_POLL_SECONDS", "30"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "8"))
+
+# batch mode: rendered videos waiting for the background uploader
+UPLOAD_QUEUE_DEPTH = int(os.getenv("UPLOAD_QUEUE_DEPTH", "2"))
+
+# pipe     = stream raw frames straight into ffmpeg (no intermediate PNGs)
+# frames   = legacy mode, write frame_%05d.png to a temp dir then encode
+# parallel = like frames, but scenes are rendered across a process pool
+# segments = each scene rendered + encoded by its own worker, then
+#            joined losslessly with the concat demuxer (opt-in)
+RENDER_MODE = os.getenv("RENDER_MODE", "pipe").lower()
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "0"))  # 0 = cpu count
+SCENE_CACHE_MAX_MB = int(os.getenv("SCENE_CACHE_MAX_MB", "2048"))
+
+BACKGROUND_MUSIC = os.getenv("BACKGROUND_MUSIC", "false").lower() in (
+    "1", "true", "yes", "on"
+)
+MUSIC_VOLUME = float(os.getenv("MUSIC_VOLUME", "0.18"))
 
 AUTO_SKIP_UPLOAD_LIMIT = os.getenv(
     "AUTO_SKIP_UPLOAD_LIMIT", "true"
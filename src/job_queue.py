@@ -0,0 +1,197 @@
+import argparse
+import json
+import random
+import time
+import traceback
+from typing import Callable, Dict, Optional
+
+from .config import JOB_MAX_ATTEMPTS, JOB_POLL_SECONDS
+from .utils.db import connect
+
+BATCH_SIZE = 20
+BACKOFF_BASE = 60       # seconds; doubles per attempt
+BACKOFF_MAX = 6 * 3600
+STALE_LOCK = 3600       # a "running" job older than this was orphaned
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind       TEXT NOT NULL,
+    payload    TEXT NOT NULL,
+    status     TEXT NOT NULL,   -- pending | running | done | failed
+    run_at     REAL NOT NULL,
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    locked_at  REAL,
+    last_error TEXT,
+    result     TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_due ON jobs (status, run_at);
+"""
+
+
+# =========================================================
+# JOB STORE
+# Post-upload actions (answers comment, ...) are rows in the
+# shared state DB, so they survive the process that queued
+# them and run whenever they come due.
+# =========================================================
+class JobQueue:
+    def __init__(self, path: Optional[str] = None):
+        self.conn = connect(path) if path else connect()
+        self.conn.executescript(SCHEMA)
+
+    def enqueue(self, kind: str, payload: dict, delay_seconds: float = 0) -> int:
+        now = time.time()
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO jobs (kind, payload, status, run_at, created_at) "
+                "VALUES (?, ?, 'pending', ?, ?)",
+                (kind, json.dumps(payload), now + delay_seconds, now),
+            )
+        return cur.lastrowid
+
+    def claim_due(self, limit: int = BATCH_SIZE) -> list:
+        """
+        Atomically move up to `limit` due jobs to running.
+        """
+        now = time.time()
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            rows = self.conn.execute(
+                "SELECT id, kind, payload, attempts FROM jobs "
+                "WHERE (status = 'pending' AND run_at <= ?) "
+                "   OR (status = 'running' AND locked_at <= ?) "
+                "ORDER BY run_at LIMIT ?",
+                (now, now - STALE_LOCK, limit),
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE jobs SET status = 'running', locked_at = ? WHERE id = ?",
+                [(now, r["id"]) for r in rows],
+            )
+        return [
+            {
+                "id": r["id"],
+                "kind": r["kind"],
+                "payload": json.loads(r["payload"]),
+                "attempts": r["attempts"],
+            }
+            for r in rows
+        ]
+
+    def complete(self, job_id: int, result=None):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET status = 'done', locked_at = NULL, result = ? "
+                "WHERE id = ?",
+                (json.dumps(result), job_id),
+            )
+
+    def retry(self, job_id: int, attempts: int, error: str):
+        """
+        Reschedule with exponential backoff, or give up after
+        JOB_MAX_ATTEMPTS.
+        """
+        if attempts >= JOB_MAX_ATTEMPTS:
+            status, run_at = "failed", time.time()
+        else:
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1))
+            status, run_at = "pending", time.time() + delay * random.uniform(1, 1.2)
+
+        with self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, run_at = ?, attempts = ?, "
+                "locked_at = NULL, last_error = ? WHERE id = ?",
+                (status, run_at, attempts, error, job_id),
+            )
+        return status
+
+
+# =========================================================
+# HANDLERS
+# handler(youtube, payload) -> result (stored on the job)
+# =========================================================
+def _comment(youtube, payload: dict):
+    from .youtube_uploader import post_comment
+
+    return post_comment(payload["video_id"], payload["text"], youtube=youtube)
+
+
+HANDLERS: Dict[str, Callable] = {
+    "comment": _comment,
+}
+
+
+# =========================================================
+# WORKER
+# One authenticated client is built on first use and shared
+# by every job the worker runs.
+# =========================================================
+class JobWorker:
+    def __init__(self, queue: JobQueue):
+        self.queue = queue
+        self._youtube = None
+
+    @property
+    def youtube(self):
+        if self._youtube is None:
+            from .youtube_uploader import get_youtube_client
+
+            self._youtube = get_youtube_client()
+        return self._youtube
+
+    def run_due(self) -> int:
+        """
+        Run every job that is due now. Returns the number of jobs run.
+        """
+        ran = 0
+        while True:
+            jobs = self.queue.claim_due()
+            if not jobs:
+                return ran
+
+            for job in jobs:
+                self._run(job)
+                ran += 1
+
+    def _run(self, job: dict):
+        handler = HANDLERS.get(job["kind"])
+        attempts = job["attempts"] + 1
+
+        if handler is None:
+            self.queue.retry(job["id"], JOB_MAX_ATTEMPTS, f"unknown kind {job['kind']}")
+            print(f"[jobs] #{job['id']} unknown kind {job['kind']!r} — failed")
+            return
+
+        try:
+            result = handler(self.youtube, job["payload"])
+        except Exception as e:
+            traceback.print_exc()
+            status = self.queue.retry(job["id"], attempts, str(e))
+            print(f"[jobs] #{job['id']} {job['kind']} failed (attempt {attempts}) → {status}")
+            return
+
+        self.queue.complete(job["id"], result)
+        print(f"[jobs] #{job['id']} {job['kind']} done")
+
+    def run_forever(self, poll_seconds: int = JOB_POLL_SECONDS):
+        while True:
+            self.run_due()
+            time.sleep(poll_seconds)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run delayed post-upload jobs")
+    parser.add_argument("--once", action="store_true", help="run due jobs and exit")
+    args = parser.parse_args(argv)
+
+    worker = JobWorker(JobQueue())
+    if args.once:
+        worker.run_due()
+        return
+
+    worker.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,18 +5,32 @@ import os
 import tempfile
 import shutil
 import json
-import subprocess
 import random
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 
-from .picker_episode import build_episode
+from .picker_episode import build_episode, build_episodes
 from .audio.narrator import generate_episode_audio
 from .audio.timeline import build_timeline
 from .renderer.scene_renderer import render_scene
 from .renderer.timeline_renderer import group_timeline
-from .renderer.video_builder import build_video
-
-from .youtube_uploader import upload_short, post_comment
-from .config import DRY_RUN, CACHE_DIR
+from .renderer.video_builder import build_video, open_video_sink
+from .renderer.parallel import render_scenes_parallel
+from .renderer.segments import render_segments
+
+from .youtube_uploader import upload_short
+from .job_queue import JobQueue, JobWorker
+from .upload_worker import UploadWorker
+from .runs import load_manifest, new_manifest, run_dir, save_manifest
+from .renderer.quiz_renderer import pick_music
+from .config import (
+    DRY_RUN,
+    CACHE_DIR,
+    COMMENT_DELAY_HOURS,
+    RENDER_MODE,
+    RENDER_WORKERS,
+    BACKGROUND_MUSIC,
+)
 
 FPS = 30
 
@@ -100,12 +114,102 @@ def build_yt_description(episode: dict, hook: str) -> str:
 
 
 # =====================================================
-# MAIN
+# RENDER
 # =====================================================
-def main():
-    print("main() entered")
+def render_episode_video(
+    scenes: list,
+    episode: dict,
+    narration: str,
+    music: str | None = None,
+    prefix: str = "episode",
+) -> str:
+    """
+    Render + encode + mux in one pass: the returned mp4 already carries
+    the narration (and the ducked music bed, if any).
+    """
+    if RENDER_MODE == "frames":
+        return _render_via_frames(scenes, episode, narration, music, prefix)
+    if RENDER_MODE == "parallel":
+        return _render_via_frames(
+            scenes, episode, narration, music, prefix, parallel=True
+        )
+    if RENDER_MODE == "segments":
+        return render_segments(
+            scenes,
+            episode,
+            output_dir="output/renders",
+            prefix=prefix,
+            fps=FPS,
+            narration=narration,
+            music=music,
+            workers=RENDER_WORKERS,
+        )
+
+    sink = open_video_sink(
+        "output/renders", FPS, prefix, narration=narration, music=music
+    )
+    with sink:
+        frame_index = 0
+        for scene in scenes:
+            used = render_scene(scene, frame_index, sink, episode)
+            frame_index += used
+            print(f"  Rendered {scene['type']} -> {used} frames")
+        print("Total frames:", frame_index)
+        print("Finishing encode...")
+    return sink.path
+
+
+def _render_via_frames(
+    scenes: list,
+    episode: dict,
+    narration: str,
+    music: str | None,
+    prefix: str,
+    parallel: bool = False,
+) -> str:
+    frames_dir = tempfile.mkdtemp(prefix="episode_frames_")
+    try:
+        if parallel:
+            frame_index = render_scenes_parallel(
+                scenes, episode, frames_dir, RENDER_WORKERS
+            )
+        else:
+            frame_index = 0
+            for scene in scenes:
+                used = render_scene(scene, frame_index, frames_dir, episode)
+                frame_index += used
+                print(f"  Rendered {scene['type']} -> {used} frames")
 
-    episode = build_episode()
+        print("Total frames:", frame_index)
+        print("Building video...")
+        return build_video(
+            frames_dir=frames_dir,
+            output_dir="output/renders",
+            fps=FPS,
+            music=music,
+            prefix=prefix,
+            narration=narration,
+        )
+    finally:
+        shutil.rmtree(frames_dir, ignore_errors=True)
+        print("Temp frames removed")
+
+
+# =====================================================
+# STAGES
+# Each stage reads/writes the run manifest. A stage returns
+# True when done; False halts the run without marking it
+# complete (so a later --resume retries it).
+# Stages resume whole: a render interrupted mid-video only
+# reuses finished scenes with RENDER_MODE=segments (scene
+# segment cache); the default pipe mode re-renders it all.
+# =====================================================
+def stage_pick(m: dict) -> bool:
+    apply_episode(m, build_episode())
+    return True
+
+
+def apply_episode(m: dict, episode: dict):
     hook_data = pick_hook()
     episode["hook"] = hook_data["hook"]
 
@@ -115,78 +219,259 @@ def main():
     for i, q in enumerate(episode["questions"], 1):
         print(f"{i}. [{q['difficulty'].upper()}] {q['question']}")
 
+    m["episode"] = episode
+    m["hook_style"] = hook_data["style"]
+    m["title"] = build_yt_title(episode["hook"])
+    m["description"] = build_yt_description(episode, episode["hook"])
+
+
+def stage_tts(m: dict) -> bool:
     print("\nGenerating narration...")
-    audio_files = generate_episode_audio(episode)
-    print("Building master timeline...")
-    master_audio, timestamps = build_timeline(audio_files)
+    out_dir = run_dir(m["run_id"]) / "audio"
+    audio_files = generate_episode_audio(m["episode"], out_dir=out_dir)
+    m["audio_files"] = [[name, str(path)] for name, path in audio_files]
+    return True
 
-    print("\nConverting timeline to scenes...")
-    scenes = group_timeline(timestamps)
 
-    frames_dir = tempfile.mkdtemp(prefix="episode_frames_")
-    final_video = None
+def stage_timeline(m: dict) -> bool:
+    print("Building master timeline...")
+    master_audio, timestamps = build_timeline(
+        m["audio_files"], out_path=str(run_dir(m["run_id"]) / "master.wav")
+    )
+    m["master_audio"] = master_audio
+    m["timestamps"] = timestamps
+    return True
 
-    try:
-        frame_index = 0
-        print("\nRendering video from scenes...")
-        for scene in scenes:
-            used = render_scene(scene, frame_index, frames_dir, episode)
-            frame_index += used
-            print(f"  Rendered {scene['type']} -> {used} frames")
 
-        print("Total frames:", frame_index)
-        print("Building silent video...")
-        video_path = build_video(
-            frames_dir=frames_dir,
-            output_dir="output/renders",
-            fps=FPS,
-            music=None,
-            prefix="episode",
+def stage_render(m: dict) -> bool:
+    print("\nConverting timeline to scenes...")
+    scenes = group_timeline(m["timestamps"])
+
+    music = pick_music() if BACKGROUND_MUSIC else None
+    if music:
+        print("Music bed:", music)
+
+    print("\nRendering video from scenes...")
+    final_video = render_episode_video(
+        scenes,
+        m["episode"],
+        m["master_audio"],
+        music,
+        prefix=f"episode_{m['run_id']}",
+    )
+    print("Episode video ready:", final_video)
+
+    m["video_path"] = final_video
+    m["music"] = music
+    return True
+
+
+def stage_upload(m: dict) -> bool:
+    if m.get("video_id"):
+        raise RuntimeError(
+            f"Run {m['run_id']} is already uploaded as {m['video_id']}; "
+            "refusing to upload it again"
         )
+    print("Title:", m["title"])
 
-        print("Attaching narration audio...")
-        final_video = video_path.replace(".mp4", "_final.mp4")
-        subprocess.run(
-            [
-                "ffmpeg", "-y",
-                "-i", video_path,
-                "-i", master_audio,
-                "-c:v", "copy",
-                "-c:a", "aac",
-                "-b:a", "192k",
-                final_video,
-            ],
-            check=True,
-        )
-        print("Episode video ready:", final_video)
+    if DRY_RUN:
+        print("DRY RUN — skipping upload")
+        return False
+
+    print("Uploading to YouTube...")
+    video_id = upload_short(m["video_path"], m["title"], m["description"])
+    if not video_id:
+        print("Upload skipped — resume this run later to retry")
+        return False
+
+    m["video_id"] = video_id
+    return True
+
+
+def stage_comment(m: dict) -> bool:
+    # posted once due by whichever worker drains the queue: the scheduler
+    # daemon, `python -m src.job_queue`, or the end of a later run
+    print(f"Queueing answers comment in {COMMENT_DELAY_HOURS}h...")
+    answers = "\n".join(
+        f"{i+1}. {q['answer']}" for i, q in enumerate(m["episode"]["questions"])
+    )
+    m["comment_job"] = JobQueue().enqueue(
+        "comment",
+        {
+            "video_id": m["video_id"],
+            "text": f"ANSWERS:\n{answers}\n\nComment your score below!",
+            "run_id": m["run_id"],
+        },
+        delay_seconds=COMMENT_DELAY_HOURS * 3600,
+    )
+    return True
+
+
+STAGES = [
+    ("pick", stage_pick),
+    ("tts", stage_tts),
+    ("timeline", stage_timeline),
+    ("render", stage_render),
+    ("upload", stage_upload),
+    ("comment", stage_comment),
+]
+
+# local, idempotent stages: redoing one makes the later ones stale.
+# Upload and comment are never redone once they have completed.
+REDO_CASCADE = {"tts", "timeline", "render"}
+
+# files a completed stage must have left behind to be skippable
+STAGE_OUTPUTS = {
+    "tts": lambda m: [path for _, path in m.get("audio_files", [])],
+    "timeline": lambda m: [m.get("master_audio")],
+    "render": lambda m: [m.get("video_path")],
+}
+
+
+def _stage_done(m: dict, name: str) -> bool:
+    if name not in m["completed"]:
+        return False
+    if m.get("video_id"):
+        return True  # uploaded: local outputs are no longer needed
+    outputs = STAGE_OUTPUTS.get(name)
+    if outputs and not all(p and os.path.isfile(p) for p in outputs(m)):
+        print(f"[{name}] outputs missing — redoing stage")
+        return False
+    return True
+
+
+def run_pipeline(m: dict, until: str | None = None) -> dict:
+    """
+    Run stages in order, skipping the ones already completed.
+    The manifest is persisted after every stage.
+    """
+    save_manifest(m)
+    print("Run:", m["run_id"])
+
+    redo = False
+    for name, stage in STAGES:
+        cascade = redo and name in REDO_CASCADE
+        if not cascade and _stage_done(m, name):
+            print(f"[{name}] already done — skipping")
+        else:
+            # once a stage is redone, the local stages after it are stale
+            redo = True
+            m["completed"] = [s for s in m["completed"] if s != name]
+            if not stage(m):
+                save_manifest(m)
+                return m
+            m["completed"].append(name)
+            save_manifest(m)
+
+        if name == until:
+            break
+
+    return m
 
-    finally:
-        shutil.rmtree(frames_dir, ignore_errors=True)
-        print("Temp frames removed")
 
-    if not final_video:
-        print("Video not created — skipping upload")
-        return None
+# =====================================================
+# BATCH
+# N episodes in one process: caches (fonts, plates, scene
+# segments, TTS clips) stay warm, narration for episode k+1
+# is prepared while episode k renders, and finished videos
+# upload in the background while the next one renders.
+# =====================================================
+def run_batch(count: int) -> list:
+    manifests = []
+    for episode in build_episodes(count):
+        m = new_manifest()
+        apply_episode(m, episode)
+        m["completed"].append("pick")
+        save_manifest(m)
+        manifests.append(m)
+
+    with (
+        ThreadPoolExecutor(max_workers=1) as prep,
+        UploadWorker(run_pipeline) as uploader,
+    ):
+        pending = prep.submit(run_pipeline, manifests[0], "timeline")
+
+        for k, m in enumerate(manifests):
+            pending.result()
+            if k + 1 < len(manifests):
+                pending = prep.submit(run_pipeline, manifests[k + 1], "timeline")
+
+            print(f"\n=== Episode {k + 1}/{len(manifests)} ===")
+            run_pipeline(m, until="render")
+            if "render" in m["completed"]:
+                uploader.submit(m)
+
+    return manifests
 
-    title = build_yt_title(episode["hook"])
-    description = build_yt_description(episode, episode["hook"])
-    print("Title:", title)
 
+# =====================================================
+# POST-UPLOAD JOBS
+# A one-shot run exits long before its comment is due, so
+# every run drains whatever is due by now (earlier runs'
+# comments) and says where the new one will be posted from.
+# =====================================================
+def drain_jobs(manifests: list):
     if DRY_RUN:
-        print("DRY RUN — skipping upload")
-        return final_video
+        return
+    queue = JobQueue()
+    ran = JobWorker(queue).run_due()
+    if ran:
+        print(f"[jobs] Ran {ran} due job(s)")
+
+    queued = [m for m in manifests if m.get("comment_job")]
+    if queued:
+        print(
+            f"[jobs] {len(queued)} answers comment(s) queued — posted once due "
+            "by the scheduler daemon, `python -m src.job_queue`, "
+            "or the next run after that"
+        )
 
-    print("Uploading to YouTube...")
-    video_id = upload_short(final_video, title, description)
 
-    if video_id:
-        print("Posting pinned answers comment...")
-        answers = "\n".join(
-            f"{i+1}. {q['answer']}" for i, q in enumerate(episode["questions"])
+# =====================================================
+# MAIN
+# =====================================================
+def positive_int(value: str) -> int:
+    try:
+        n = int(value)
+    except ValueError:
+        n = 0
+    if n < 1:
+        raise argparse.ArgumentTypeError(
+            f"expected a positive integer, got {value!r}"
         )
-        post_comment(video_id, f"ANSWERS:\n{answers}\n\nComment your score below!")
+    return n
+
+
+def main(argv=None):
+    print("main() entered")
 
-    return final_video
+    parser = argparse.ArgumentParser(
+        description="Generate and publish a quiz episode"
+    )
+    parser.add_argument(
+        "--resume", metavar="RUN_ID", help="continue a previous run"
+    )
+    parser.add_argument(
+        "--batch",
+        type=positive_int,
+        metavar="N",
+        help="generate N episodes in one process",
+    )
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        manifests = run_batch(args.batch)
+        drain_jobs(manifests)
+        return [m.get("video_path") for m in manifests]
+
+    if args.resume:
+        m = load_manifest(args.resume)
+    else:
+        m = new_manifest()
+
+    m = run_pipeline(m)
+    drain_jobs([m])
+    return m.get("video_path")
 
 
 if __name__ == "__main__":
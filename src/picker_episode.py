@@ -1,6 +1,6 @@
-import json
 import random
-from pathlib import Path
+
+from .question_store import get_store
 
 DIFFICULTY_ORDER = ["easy", "medium", "hard", "impossible", "genius"]
 
@@ -18,53 +18,15 @@ OUTROS = [
     "I want to see who survives question five.",
 ]
 
-DATA_PATH = Path("data/questions.json")
-USED_PATH = Path("data/used.json")
-
-
-def load_questions():
-    with open(DATA_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def load_used():
-    if not USED_PATH.exists():
-        return set()
-    return set(json.loads(USED_PATH.read_text()))
-
-
-def save_used(ids):
-    USED_PATH.write_text(json.dumps(list(ids), indent=2))
-
-
-def pick_by_difficulty(questions, difficulty, used):
-    pool = [
-        q
-        for q in questions
-        if q["difficulty"] == difficulty and q["question"] not in used
-    ]
-
-    if not pool:  # reset if exhausted
-        pool = [q for q in questions if q["difficulty"] == difficulty]
 
-    q = random.choice(pool) if pool else None
-    if q:
-        used.add(q["question"])
-    return q
-
-
-def build_episode():
-    questions = load_questions()
-    used = load_used()
+def _pick_episode(store):
     selected = []
 
     for diff in DIFFICULTY_ORDER:
-        q = pick_by_difficulty(questions, diff, used)
+        q = store.pick(diff)
         if q:
             selected.append(q)
 
-    save_used(used)
-
     if len(selected) < 3:
         raise Exception("Not enough questions")
 
@@ -73,3 +35,20 @@ def build_episode():
         "questions": selected,
         "outro": random.choice(OUTROS),
     }
+
+
+def build_episode():
+    return build_episodes(1)[0]
+
+
+def build_episodes(count):
+    """
+    Pick `count` episodes in one store session (one lock or
+    transaction), so the episodes get disjoint questions and
+    concurrent workers never pick the same question.
+    """
+    store = get_store()
+    with store.session():
+        episodes = [_pick_episode(store) for _ in range(count)]
+
+    return episodes
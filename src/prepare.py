@@ -0,0 +1,147 @@
+import argparse
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from .audio.narrator import build_answer_text, build_question_text
+from .audio.timeline import ANSWER_DURATION, QUESTION_TOTAL
+from .audio.tts import tts_batch
+from .bundles import load_bundle, save_bundle
+from .picker_episode import DIFFICULTY_ORDER
+from .question_store import DATA_PATH
+from .question_store.base import source_questions
+from .renderer.quiz_renderer import compute_layout, question_text_runs
+from .renderer.sprites import sprite_key, text_sprite
+
+
+def _duration_ms(path: Path) -> Optional[int]:
+    try:
+        out = subprocess.run(
+            [
+                "ffprobe", "-v", "error",
+                "-show_entries", "format=duration",
+                "-of", "default=noprint_wrappers=1:nokey=1",
+                str(path),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        return int(float(out.strip()) * 1000)
+    except (OSError, ValueError, subprocess.CalledProcessError):
+        return None
+
+
+def episode_positions(questions) -> dict:
+    """
+    difficulty -> 1-based position in an episode. The picker takes one
+    question per difficulty in DIFFICULTY_ORDER and skips difficulties
+    the bank has none of, so the position follows from the bank.
+    """
+    present = {q.get("difficulty") for q in questions}
+    order = [d for d in DIFFICULTY_ORDER if d in present]
+    return {diff: i for i, diff in enumerate(order, 1)}
+
+
+def narration_texts(q: dict, index: Optional[int]) -> dict:
+    # same texts generate_episode_audio builds for position `index`
+    texts = {"answer": build_answer_text(q)}
+    if index is not None:
+        texts["question"] = build_question_text(index, q)
+    return texts
+
+
+# =========================================================
+# PREPARE
+# Offline pass over the question bank: layout, text sprites,
+# narration clips (into the TTS cache) and their durations,
+# one bundle per question. Episode assembly then hits caches.
+# =========================================================
+def prepare_question(q: dict, index: Optional[int]) -> dict:
+    layout = compute_layout(q)
+    sprites = []
+    for run in question_text_runs(q, layout):
+        text_sprite(*run, persist=True)
+        sprites.append(sprite_key(*run))
+
+    return {
+        "id": q["id"],
+        "layout": layout,
+        "sprites": sprites,
+        "narration": {
+            kind: {"text": text, "ms": None}
+            for kind, text in narration_texts(q, index).items()
+        },
+    }
+
+
+def prepare_all(questions, force: bool = False, tts: bool = True) -> int:
+    positions = episode_positions(questions)
+
+    def stale(q):
+        bundle = load_bundle(q)
+        if bundle is None or (tts and not bundle.get("tts")):
+            return True
+        texts = narration_texts(q, positions.get(q.get("difficulty")))
+        return {k: e["text"] for k, e in bundle["narration"].items()} != texts
+
+    todo = [q for q in questions if force or stale(q)]
+    print(f"[prepare] {len(todo)}/{len(questions)} questions need a bundle")
+    if not todo:
+        return 0
+
+    started = time.time()
+    bundles = [
+        (q, prepare_question(q, positions.get(q.get("difficulty")))) for q in todo
+    ]
+    print(f"[prepare] Layout + sprites in {time.time() - started:.1f}s")
+
+    if tts:
+        with tempfile.TemporaryDirectory() as tmp:
+            clips = []
+            for n, (q, bundle) in enumerate(bundles):
+                for kind, entry in bundle["narration"].items():
+                    clips.append((entry, Path(tmp) / f"{n}_{kind}.wav"))
+
+            # one batch: misses are synthesized concurrently and cached
+            tts_batch([(entry["text"], path) for entry, path in clips])
+            for entry, path in clips:
+                entry["ms"] = _duration_ms(path)
+
+        slots = {"question": QUESTION_TOTAL, "answer": ANSWER_DURATION}
+        for q, bundle in bundles:
+            for kind, entry in bundle["narration"].items():
+                if entry["ms"] and entry["ms"] > slots[kind]:
+                    print(
+                        f"[prepare] {q['id']} {kind} clip is {entry['ms']}ms "
+                        f"(slot {slots[kind]}ms) — will be cut"
+                    )
+
+    for q, bundle in bundles:
+        # a clip without a duration failed: leave the flag off so the
+        # next prepare (or the render) synthesizes it again
+        if tts and all(
+            isinstance(e["ms"], int) for e in bundle["narration"].values()
+        ):
+            bundle["tts"] = True
+        save_bundle(q, bundle)
+
+    print(f"[prepare] {len(bundles)} bundles written in {time.time() - started:.1f}s")
+    return len(bundles)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Precompute per-question bundles (layout, sprites, narration)"
+    )
+    parser.add_argument("--force", action="store_true", help="rebuild every bundle")
+    parser.add_argument("--no-tts", action="store_true", help="skip narration clips")
+    args = parser.parse_args(argv)
+
+    prepare_all(source_questions(DATA_PATH), force=args.force, tts=not args.no_tts)
+
+
+if __name__ == "__main__":
+    main()
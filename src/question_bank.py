@@ -0,0 +1,176 @@
+import hashlib
+import os
+import pickle
+import random
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .config import CACHE_DIR
+
+INDEX_PATH = Path(CACHE_DIR) / "questions.idx"
+INDEX_VERSION = 1
+
+
+def question_id(q: dict) -> str:
+    """
+    Stable id: an explicit "id" field if the bank has one, else a
+    hash of the question text (the text is what used to identify it).
+    """
+    if q.get("id"):
+        return str(q["id"])
+    text = " ".join(q["question"].split()).lower()
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def ids_for_texts(questions: List[dict], texts: Iterable[str]) -> List[str]:
+    """
+    Ids for question texts (the legacy used.json format). Looked up in
+    the loaded questions, so explicit "id" fields are honoured.
+    """
+    by_text = {q["question"]: question_id(q) for q in questions}
+    return [by_text.get(t) or question_id({"question": t}) for t in texts]
+
+
+# =========================================================
+# BUCKET
+# Set of ids with O(1) add/remove/random pick: a list plus a
+# position map, removal swaps the last element into the hole.
+# =========================================================
+class Bucket:
+    def __init__(self, ids: Iterable[str] = ()):
+        self.items: List[str] = []
+        self.pos: Dict[str, int] = {}
+        for qid in ids:
+            self.add(qid)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, qid):
+        return qid in self.pos
+
+    def add(self, qid: str):
+        if qid not in self.pos:
+            self.pos[qid] = len(self.items)
+            self.items.append(qid)
+
+    def remove(self, qid: str):
+        i = self.pos.pop(qid, None)
+        if i is None:
+            return
+        last = self.items.pop()
+        if i < len(self.items):
+            self.items[i] = last
+            self.pos[last] = i
+
+    def choice(self) -> str:
+        return random.choice(self.items)
+
+
+# =========================================================
+# QUESTION BANK
+# Unused ids are bucketed per difficulty and per
+# (difficulty, category); consuming a question removes it from
+# both in O(1). An exhausted difficulty starts a new cycle, and
+# so does consuming an id that is already used (that is how a
+# replayed usage log reproduces the resets).
+# =========================================================
+class QuestionBank:
+    def __init__(self, questions: List[dict], used: Iterable[str] = ()):
+        self.by_id: Dict[str, dict] = {}
+        self.all_ids: Dict[str, List[str]] = {}
+
+        for q in questions:
+            qid = question_id(q)
+            if qid in self.by_id:
+                continue
+            self.by_id[qid] = q
+            self.all_ids.setdefault(q["difficulty"], []).append(qid)
+
+        self.used = set()
+        self.unused: Dict[str, Bucket] = {}
+        self.unused_cat: Dict[tuple, Bucket] = {}
+        for difficulty in self.all_ids:
+            self.reset(difficulty)
+        for qid in used:
+            self.consume(qid)
+
+    def reset(self, difficulty: str):
+        ids = self.all_ids.get(difficulty, [])
+        self.used.difference_update(ids)
+        self.unused[difficulty] = Bucket(ids)
+        for key in [k for k in self.unused_cat if k[0] == difficulty]:
+            del self.unused_cat[key]
+        for qid in ids:
+            key = (difficulty, self.by_id[qid].get("category"))
+            self.unused_cat.setdefault(key, Bucket()).add(qid)
+
+    def consume(self, qid: str):
+        q = self.by_id.get(qid)
+        if q is None:
+            return
+        if qid in self.used:
+            self.reset(q["difficulty"])
+        self.used.add(qid)
+        self.unused[q["difficulty"]].remove(qid)
+        bucket = self.unused_cat.get((q["difficulty"], q.get("category")))
+        if bucket is not None:
+            bucket.remove(qid)
+
+    def _bucket(self, difficulty: str, category: Optional[str]) -> Optional[Bucket]:
+        if category is None:
+            return self.unused.get(difficulty)
+        return self.unused_cat.get((difficulty, category))
+
+    def pick(self, difficulty: str, category: Optional[str] = None) -> Optional[dict]:
+        bucket = self._bucket(difficulty, category)
+        if bucket is None:  # no such difficulty/category at all
+            return None
+
+        if not bucket:  # reset if exhausted
+            self.reset(difficulty)
+            bucket = self._bucket(difficulty, category)
+
+        qid = bucket.choice()
+        self.consume(qid)
+        return self.by_id[qid]
+
+    def ids_to_text(self, ids: Iterable[str]) -> List[str]:
+        return [self.by_id[qid]["question"] for qid in ids if qid in self.by_id]
+
+
+# =========================================================
+# ON-DISK INDEX
+# Parsed questions + ids pickled next to the other caches and
+# keyed by the source file's size/mtime, so a process skips
+# JSON parsing and id hashing when the bank has not changed.
+# =========================================================
+def _signature(path: Path) -> tuple:
+    st = os.stat(path)
+    return (INDEX_VERSION, str(Path(path).resolve()), st.st_size, st.st_mtime_ns)
+
+
+def load_index(path: Path, parse) -> List[dict]:
+    """
+    Questions from the index if it matches `path`, else `parse(path)`
+    and rewrite the index.
+    """
+    sig = _signature(path)
+    try:
+        with open(INDEX_PATH, "rb") as f:
+            cached_sig, questions = pickle.load(f)
+        if cached_sig == sig:
+            return questions
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError, ValueError):
+        pass
+
+    questions = parse(path)
+    for q in questions:
+        q.setdefault("id", question_id(q))
+
+    INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = INDEX_PATH.with_name(f"{INDEX_PATH.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump((sig, questions), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, INDEX_PATH)
+    return questions
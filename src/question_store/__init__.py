@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+
+from ..config import (
+    MONGO_DB,
+    MONGO_URI,
+    QUESTION_COOLDOWN_DAYS,
+    QUESTION_DB,
+    QUESTION_STORE,
+)
+from ..question_bank import ids_for_texts
+from ..usage_log import UsageLog
+from .base import QuestionStore, source_questions
+
+DATA_PATH = Path("data/questions.json")
+USED_PATH = Path("data/used.json")  # legacy, migrated into the usage log
+USED_LOG_PATH = Path("data/used.log")
+
+_store = None
+
+
+def _existing_usage() -> list:
+    """Ids already used by the file-based store, to seed a new DB store."""
+    ids, _ = UsageLog(USED_LOG_PATH).read()
+    if not ids and USED_PATH.exists():
+        texts = json.loads(USED_PATH.read_text())
+        ids = ids_for_texts(source_questions(DATA_PATH), texts)
+    return ids
+
+
+def open_store(kind: str = QUESTION_STORE) -> QuestionStore:
+    """
+    json   = questions.json + append-only usage log (default)
+    sqlite = QUESTION_DB, synced from questions.json
+    mongo  = MONGO_URI / MONGO_DB, synced from questions.json
+    """
+    cooldown = QUESTION_COOLDOWN_DAYS * 86400
+
+    if kind == "json":
+        from .json_store import JsonQuestionStore
+
+        return JsonQuestionStore(DATA_PATH, USED_LOG_PATH, legacy_used_path=USED_PATH)
+
+    if kind == "sqlite":
+        from .sqlite_store import SqliteQuestionStore
+
+        return SqliteQuestionStore(
+            QUESTION_DB, cooldown, source=DATA_PATH, used_ids=_existing_usage()
+        )
+
+    if kind == "mongo":
+        if not MONGO_URI:
+            raise RuntimeError("QUESTION_STORE=mongo requires MONGO_URI")
+        from .mongo_store import MongoQuestionStore
+
+        return MongoQuestionStore(
+            MONGO_URI, MONGO_DB, cooldown, source=DATA_PATH, used_ids=_existing_usage()
+        )
+
+    raise ValueError(f"Unknown QUESTION_STORE: {kind!r}")
+
+
+def get_store() -> QuestionStore:
+    """Process-wide store for the configured backend."""
+    global _store
+    if _store is None:
+        _store = open_store()
+    return _store
@@ -0,0 +1,55 @@
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional
+
+from ..question_bank import load_index
+
+
+def load_questions(path) -> List[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def file_sig(path):
+    try:
+        st = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def source_questions(path) -> List[dict]:
+    """questions.json through the pickled index; every item has an "id"."""
+    return load_index(Path(path), load_questions)
+
+
+# =========================================================
+# QUESTION STORE
+# Everything the picker needs from a question backend:
+#
+#   with store.session():           # one atomic pick/record unit
+#       q = store.pick("hard")      # picked == consumed
+#
+# Questions are plain dicts (the questions.json shape) with a
+# stable "id".
+# =========================================================
+class QuestionStore(ABC):
+    name = "base"
+
+    @abstractmethod
+    def session(self):
+        """
+        Context manager around one episode's picks; the picks are
+        recorded when it exits cleanly.
+        """
+
+    @abstractmethod
+    def pick(self, difficulty: str, category: Optional[str] = None) -> Optional[dict]:
+        """
+        A question of `difficulty` (optionally `category`) that has not
+        been used recently, marked as used. None if there are none at all.
+        """
+
+    def close(self):
+        pass
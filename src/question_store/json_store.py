@@ -0,0 +1,95 @@
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+from ..question_bank import QuestionBank, ids_for_texts, question_id
+from ..usage_log import UsageLog, should_compact
+from .base import QuestionStore, file_sig, source_questions
+
+
+# =========================================================
+# JSON STORE
+# questions.json + the append-only usage log (data/used.log).
+# The bank is kept per process; each session replays only the
+# log lines appended since the last one.
+# =========================================================
+class JsonQuestionStore(QuestionStore):
+    name = "json"
+
+    def __init__(self, data_path, used_log_path, legacy_used_path=None):
+        self.data_path = Path(data_path)
+        self.log = UsageLog(used_log_path)
+        self.legacy_used_path = Path(legacy_used_path) if legacy_used_path else None
+
+        self.bank = None
+        self._bank_sig = None
+        self._log_id = None
+        self._log_offset = 0
+        self._log_lines = 0
+        self._picked = []
+
+    def _migrate_used(self):
+        legacy = self.legacy_used_path
+        if self.log.exists() or not legacy or not legacy.exists():
+            return
+        texts = json.loads(legacy.read_text())
+        ids = ids_for_texts(source_questions(self.data_path), texts)
+        self.log.rewrite(ids)
+        print(f"Migrated {len(ids)} used questions from {legacy} to {self.log.path}")
+
+    def _load_bank(self):
+        """
+        Rebuilt only when questions.json changes or the log was
+        compacted; otherwise only new log lines are replayed.
+        """
+        sig = file_sig(self.data_path)
+        log_id = self.log.identity()
+        if self.bank is None or sig != self._bank_sig or log_id != self._log_id:
+            self.bank = QuestionBank(source_questions(self.data_path))
+            self._bank_sig, self._log_id = sig, log_id
+            self._log_offset, self._log_lines = 0, 0
+
+        ids, self._log_offset = self.log.read(self._log_offset)
+        for qid in ids:
+            self.bank.consume(qid)
+        self._log_lines += len(ids)
+
+    def _record_used(self, ids):
+        """Append our picks and compact the log once it is mostly history."""
+        if not ids:
+            return
+        self.log.append(ids)
+        self._log_lines += len(ids)
+
+        if should_compact(self._log_lines, len(self.bank.used)):
+            self.log.rewrite(self.bank.used)
+            self._log_lines = len(self.bank.used)
+
+        # our own lines are already applied; skip them on the next replay
+        self._log_id = self.log.identity()
+        self._log_offset = self.log.path.stat().st_size
+
+    @contextmanager
+    def session(self):
+        """
+        The log lock is held from replay to append, so concurrent
+        workers never pick the same question.
+        """
+        with self.log.locked():
+            self._migrate_used()
+            self._load_bank()
+            self._picked = []
+            try:
+                yield self
+            except BaseException:
+                # picks were never recorded: drop the in-memory state
+                self.bank = None
+                raise
+            self._record_used(self._picked)
+
+    def pick(self, difficulty: str, category: Optional[str] = None) -> Optional[dict]:
+        q = self.bank.pick(difficulty, category)
+        if q:
+            self._picked.append(question_id(q))
+        return q
@@ -0,0 +1,152 @@
+import random
+import time
+from contextlib import contextmanager
+from typing import Iterable, List, Optional
+
+from .base import QuestionStore, file_sig, source_questions
+
+USAGE_FIELDS = ("_id", "rnd", "last_used", "use_count")
+
+
+# =========================================================
+# MONGO STORE
+# Same model as the SQLite store (rnd / last_used / use_count
+# next to the question fields) on a "questions" collection.
+# pymongo is only imported when this backend is selected.
+# There is no multi-document transaction around a session:
+# each pick claims its question with one find_one_and_update.
+# =========================================================
+class MongoQuestionStore(QuestionStore):
+    name = "mongo"
+
+    def __init__(
+        self,
+        uri: str,
+        db_name: str,
+        cooldown: float,
+        source=None,
+        used_ids: Iterable[str] = (),
+    ):
+        try:
+            from pymongo import ASCENDING, MongoClient, ReturnDocument
+        except ImportError as e:
+            raise RuntimeError("QUESTION_STORE=mongo needs pymongo installed") from e
+
+        self._return_after = ReturnDocument.AFTER
+        self.client = MongoClient(uri)
+        db = self.client[db_name]
+        self.questions = db["questions"]
+        self.meta = db["meta"]
+        self.cooldown = cooldown
+        self.source = source
+        self._seed_used = used_ids
+
+        for keys in (
+            [("difficulty", ASCENDING), ("rnd", ASCENDING)],
+            [("difficulty", ASCENDING), ("category", ASCENDING), ("rnd", ASCENDING)],
+            [("difficulty", ASCENDING), ("last_used", ASCENDING)],
+            [("difficulty", ASCENDING), ("category", ASCENDING), ("last_used", ASCENDING)],
+        ):
+            self.questions.create_index(keys)
+
+        self._sync()
+
+    # ---------- import ----------
+    def import_questions(self, questions: List[dict]):
+        """
+        Upsert by id, keeping usage fields; documents whose id is gone
+        from `questions` are deleted, so the collection mirrors the source.
+        """
+        from pymongo import UpdateOne
+
+        self.questions.delete_many({"_id": {"$nin": [q["id"] for q in questions]}})
+
+        ops = []
+        for q in questions:
+            fields = {k: v for k, v in q.items() if k not in USAGE_FIELDS}
+            ops.append(
+                UpdateOne(
+                    {"_id": q["id"]},
+                    {
+                        "$set": fields,
+                        "$setOnInsert": {
+                            "rnd": random.random(),
+                            "last_used": None,
+                            "use_count": 0,
+                        },
+                    },
+                    upsert=True,
+                )
+            )
+        if ops:
+            self.questions.bulk_write(ops, ordered=False)
+
+    def _sync(self):
+        if not self.source:
+            return
+        sig = list(file_sig(self.source) or [])
+        state = self.meta.find_one({"_id": "source_sig"})
+        if state and state["value"] == sig:
+            return
+
+        self.import_questions(source_questions(self.source))
+        if state is None:
+            self.mark_used(list(self._seed_used))
+        self.meta.update_one(
+            {"_id": "source_sig"}, {"$set": {"value": sig}}, upsert=True
+        )
+
+    # ---------- picking ----------
+    @contextmanager
+    def session(self):
+        # nothing to commit: every pick is already recorded
+        self._sync()
+        yield self
+
+    def _claim(self, query: dict, sort: list, now: float) -> Optional[dict]:
+        return self.questions.find_one_and_update(
+            query,
+            {
+                "$set": {"last_used": now, "rnd": random.random()},
+                "$inc": {"use_count": 1},
+            },
+            sort=sort,
+            return_document=self._return_after,
+        )
+
+    def pick(self, difficulty: str, category: Optional[str] = None) -> Optional[dict]:
+        now = time.time()
+        base = {"difficulty": difficulty}
+        if category is not None:
+            base["category"] = category
+
+        eligible = {
+            "$or": [
+                {"last_used": None},
+                {"last_used": {"$lte": now - self.cooldown}},
+            ]
+        }
+        r = random.random()
+        doc = None
+        for cond in ({"$gte": r}, {"$lt": r}):
+            doc = self._claim({**base, **eligible, "rnd": cond}, [("rnd", 1)], now)
+            if doc:
+                break
+
+        if doc is None:  # everything is cooling down: reuse the oldest
+            doc = self._claim(base, [("last_used", 1)], now)
+        if doc is None:
+            return None
+
+        return {k: v for k, v in doc.items() if k not in USAGE_FIELDS}
+
+    def mark_used(self, ids: List[str], when: Optional[float] = None):
+        if not ids:
+            return
+        self.questions.update_many(
+            {"_id": {"$in": ids}},
+            {"$set": {"last_used": when or time.time()}, "$inc": {"use_count": 1}},
+        )
+
+    def close(self):
+        self.client.close()
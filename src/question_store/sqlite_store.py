@@ -0,0 +1,173 @@
+import json
+import random
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from .base import QuestionStore, file_sig, source_questions
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id         TEXT PRIMARY KEY,
+    difficulty TEXT NOT NULL,
+    category   TEXT,
+    rnd        REAL NOT NULL,    -- random sort key for indexed random picks
+    last_used  REAL,             -- NULL = never used
+    use_count  INTEGER NOT NULL DEFAULT 0,
+    data       TEXT NOT NULL     -- the question as JSON
+);
+CREATE INDEX IF NOT EXISTS idx_q_diff_rnd ON questions (difficulty, rnd);
+CREATE INDEX IF NOT EXISTS idx_q_diff_cat_rnd ON questions (difficulty, category, rnd);
+CREATE INDEX IF NOT EXISTS idx_q_diff_used ON questions (difficulty, last_used);
+CREATE INDEX IF NOT EXISTS idx_q_diff_cat_used
+    ON questions (difficulty, category, last_used);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+# =========================================================
+# SQLITE STORE
+# A question is eligible when it was never used or last used
+# more than `cooldown` seconds ago. Picks are a seek to a random
+# point on (difficulty[, category], rnd); when nothing is
+# eligible the least recently used question is taken instead,
+# via (difficulty[, category], last_used). Sessions are
+# BEGIN IMMEDIATE transactions, so concurrent workers serialize.
+# =========================================================
+class SqliteQuestionStore(QuestionStore):
+    name = "sqlite"
+
+    def __init__(self, path, cooldown: float, source=None, used_ids: Iterable[str] = ()):
+        """
+        `source` is questions.json, re-imported whenever it changes.
+        `used_ids` seeds last_used on the very first import.
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path), timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.cooldown = cooldown
+        self.source = source
+        self._seed_used = used_ids
+
+    # ---------- import ----------
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def import_questions(self, questions: List[dict]):
+        """
+        Upsert by id; usage columns of existing rows are kept. Rows
+        whose id is gone from `questions` are deleted, so the table
+        mirrors the source (an edited question gets a new id).
+        """
+        ids = {q["id"] for q in questions}
+        stale = [
+            (row["id"],)
+            for row in self.conn.execute("SELECT id FROM questions")
+            if row["id"] not in ids
+        ]
+        self.conn.executemany("DELETE FROM questions WHERE id = ?", stale)
+        self.conn.executemany(
+            "INSERT INTO questions (id, difficulty, category, rnd, data) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET difficulty = excluded.difficulty, "
+            "category = excluded.category, data = excluded.data",
+            [
+                (
+                    q["id"],
+                    q["difficulty"],
+                    q.get("category"),
+                    random.random(),
+                    json.dumps(q, ensure_ascii=False),
+                )
+                for q in questions
+            ],
+        )
+
+    def _sync(self):
+        if not self.source:
+            return
+        sig = json.dumps(file_sig(self.source))
+        if self._meta("source_sig") == sig:
+            return
+
+        first = self._meta("source_sig") is None
+        self.import_questions(source_questions(self.source))
+        if first:
+            self.mark_used(list(self._seed_used))
+        self._set_meta("source_sig", sig)
+
+    # ---------- picking ----------
+    @contextmanager
+    def session(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._sync()
+            yield self
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def _where(self, difficulty, category):
+        if category is None:
+            return "difficulty = ?", [difficulty]
+        return "difficulty = ? AND category = ?", [difficulty, category]
+
+    def _eligible(self, where, args, cutoff) -> Optional[sqlite3.Row]:
+        r = random.random()
+        for cond, bound in (("rnd >= ?", r), ("rnd < ?", r)):
+            row = self.conn.execute(
+                f"SELECT id, data FROM questions WHERE {where} AND {cond} "
+                "AND (last_used IS NULL OR last_used <= ?) ORDER BY rnd LIMIT 1",
+                args + [bound, cutoff],
+            ).fetchone()
+            if row:
+                return row
+        return None
+
+    def _least_recent(self, where, args) -> Optional[sqlite3.Row]:
+        return self.conn.execute(
+            f"SELECT id, data FROM questions WHERE {where} "
+            "ORDER BY last_used LIMIT 1",
+            args,
+        ).fetchone()
+
+    def pick(self, difficulty: str, category: Optional[str] = None) -> Optional[dict]:
+        now = time.time()
+        where, args = self._where(difficulty, category)
+
+        row = self._eligible(where, args, now - self.cooldown)
+        if row is None:  # everything is cooling down: reuse the oldest
+            row = self._least_recent(where, args)
+        if row is None:
+            return None
+
+        self.mark_used([row["id"]], now)
+        return json.loads(row["data"])
+
+    def mark_used(self, ids: List[str], when: Optional[float] = None):
+        when = when or time.time()
+        self.conn.executemany(
+            "UPDATE questions SET last_used = ?, use_count = use_count + 1, "
+            "rnd = ? WHERE id = ?",
+            [(when, random.random(), qid) for qid in ids],
+        )
+
+    def close(self):
+        self.conn.close()
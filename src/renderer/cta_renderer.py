@@ -2,10 +2,14 @@ import os
 import random
 from typing import Dict, List, Tuple
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 
 from .watermark import apply_watermark
 from .logger import log
+from .frame_sink import FrameTarget, write_frame
+from .fonts import get_font, wrap_words
+from .primitives import blend_rect, vertical_gradient
+from .sprites import blit_text, text_sprite
 
 # =========================================================
 # CONSTANTS
@@ -52,13 +56,7 @@ def fade_alpha(frame: int, start: int, duration: int = 20) -> int:
 def draw_gradient(
     img: Image.Image, top: Tuple[int, int, int], bottom: Tuple[int, int, int]
 ):
-    draw = ImageDraw.Draw(img)
-    for y in range(H):
-        t = y / (H - 1)
-        r = int(top[0] + (bottom[0] - top[0]) * t)
-        g = int(top[1] + (bottom[1] - top[1]) * t)
-        b = int(top[2] + (bottom[2] - top[2]) * t)
-        draw.line([(0, y), (W, y)], fill=(r, g, b))
+    img.paste(vertical_gradient((W, H), tuple(top), tuple(bottom)))
 
 
 def safe_icon(path: str, size: int):
@@ -81,26 +79,23 @@ def render_cta_frames(frames_dir: str, start_index: int, platform: Dict):
     icons: List[str] = platform["icons"]
     texts: List[str] = platform["cta_text"]
 
-    font = ImageFont.truetype(FONT_PATH, 48)
+    font = get_font(FONT_PATH, 48)
     logo = load_logo()
 
     log("CTA", f"Frames: {total_frames} ({platform['name']})")
 
+    # -----------------------------
+    # Background + glass card (static, built once)
+    # -----------------------------
+    background = Image.new("RGB", (W, H))
+    draw_gradient(background, theme_top, theme_bottom)
+    background = background.convert("RGBA")
+    blend_rect(background, (90, 620, 990, 1140), (255, 255, 255, 40))
+
     for i in range(total_frames):
         frame_no = start_index + i
 
-        # -----------------------------
-        # Background
-        # -----------------------------
-        img = Image.new("RGB", (W, H))
-        draw_gradient(img, theme_top, theme_bottom)
-
-        # -----------------------------
-        # Glass card
-        # -----------------------------
-        card = Image.new("RGBA", (900, 520), (255, 255, 255, 40))
-        img = img.convert("RGBA")
-        img.paste(card, (90, 620), card)
+        img = background.copy()
 
         # -----------------------------
         # CTA text
@@ -163,40 +158,27 @@ def render_cta_frames(frames_dir: str, start_index: int, platform: Dict):
         # -----------------------------
         # Save
         # -----------------------------
-        img.convert("RGB").save(os.path.join(frames_dir, f"frame_{frame_no:04d}.png"))
+        write_frame(frames_dir, frame_no, img, digits=4)
 
     log("CTA", "CTA frames done")
     return total_frames
 
 
 def wrap_text(draw, text, font, max_width):
-    words = text.split()
-    lines = []
-    line = ""
-
-    for w in words:
-        test = (line + " " + w).strip()
-        if draw.textlength(test, font=font) <= max_width:
-            line = test
-        else:
-            lines.append(line)
-            line = w
-    if line:
-        lines.append(line)
-    return lines
+    return list(wrap_words(text, font, max_width))
 
 
 # =========================================================
 # TIMELINE CTA (SINGLE SCENE MODE)
 # Used by timeline renderer instead of platform CTA
 # =========================================================
-def draw_cta_frame(frames_dir: str, start_frame: int, text: str, total_frames: int):
+def draw_cta_frame(out: FrameTarget, start_frame: int, text: str, total_frames: int):
     """
     Timeline CTA with icons + wrapped text
     """
 
-    font = ImageFont.truetype(FONT_PATH, 64)
-    small_font = ImageFont.truetype(FONT_PATH, 54)
+    font = get_font(FONT_PATH, 64)
+    small_font = get_font(FONT_PATH, 54)
     logo = load_logo()
 
     # icon paths (put pngs in assets/icons/)
@@ -215,20 +197,22 @@ def draw_cta_frame(frames_dir: str, start_frame: int, text: str, total_frames: i
         draw = ImageDraw.Draw(img)
 
         # Title
-        draw.text(
+        blit_text(
+            img,
             (W // 2, 600),
-            "SUBSCRIBE FOR DAILY QUIZ",
-            font=font,
-            fill=(255, 255, 255),
-            anchor="mm",
+            text_sprite("SUBSCRIBE FOR DAILY QUIZ", font, anchor="mm"),
+            (255, 255, 255),
         )
 
         # Wrapped message
         lines = wrap_text(draw, text, small_font, W * 0.8)
         y = 800
         for line in lines:
-            draw.text(
-                (W // 2, y), line, font=small_font, fill=(255, 200, 0), anchor="mm"
+            blit_text(
+                img,
+                (W // 2, y),
+                text_sprite(line, small_font, anchor="mm"),
+                (255, 200, 0),
             )
             y += small_font.size + 15
 
@@ -248,6 +232,6 @@ def draw_cta_frame(frames_dir: str, start_frame: int, text: str, total_frames: i
         if logo:
             img = apply_watermark(img, logo, i, corner="top-left", opacity=0.7)
 
-        img.convert("RGB").save(os.path.join(frames_dir, f"frame_{frame_no:05d}.png"))
+        write_frame(out, frame_no, img)
 
     return total_frames
@@ -0,0 +1,68 @@
+import os
+from functools import lru_cache
+from typing import Tuple
+
+from PIL import ImageFont
+
+from ..config import FONTS_DIR
+
+
+# =========================================================
+# FONT REGISTRY
+# One FreeTypeFont per (path, size) for the whole process.
+# Handles are shared, so layout results below can be keyed
+# on the font object itself.
+# =========================================================
+@lru_cache(maxsize=None)
+def get_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(path, size)
+
+
+def font_path(name: str) -> str:
+    return os.path.join(FONTS_DIR, name)
+
+
+def load_font(name: str, size: int) -> ImageFont.FreeTypeFont:
+    return get_font(font_path(name), size)
+
+
+# =========================================================
+# LAYOUT CACHE
+# =========================================================
+@lru_cache(maxsize=8192)
+def text_width(text: str, font: ImageFont.FreeTypeFont) -> float:
+    return font.getlength(text)
+
+
+@lru_cache(maxsize=4096)
+def fit_font(
+    text: str, path: str, max_size: int, min_size: int, max_width: float
+) -> ImageFont.FreeTypeFont:
+    """
+    Largest size (stepping down by 2) at which `text` fits `max_width`.
+    """
+    for size in range(max_size, min_size - 1, -2):
+        font = get_font(path, size)
+        if text_width(text, font) <= max_width:
+            return font
+    return get_font(path, min_size)
+
+
+@lru_cache(maxsize=4096)
+def wrap_words(
+    text: str, font: ImageFont.FreeTypeFont, max_width: float
+) -> Tuple[str, ...]:
+    words = text.split()
+    lines = []
+    line = ""
+
+    for w in words:
+        test = (line + " " + w).strip()
+        if text_width(test, font) <= max_width:
+            line = test
+        else:
+            lines.append(line)
+            line = w
+    if line:
+        lines.append(line)
+    return tuple(lines)
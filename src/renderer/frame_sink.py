@@ -0,0 +1,158 @@
+import os
+import shutil
+import subprocess
+from typing import Optional, Union
+
+from PIL import Image
+
+W, H = 1080, 1920
+
+
+# =========================================================
+# FFMPEG RAW FRAME SINK
+# Frames are piped as rgb24 straight into a long-lived ffmpeg
+# process, so nothing touches disk until the encoded mp4.
+# Writes block while ffmpeg's pipe buffer is full, which gives
+# natural back-pressure between the renderer and the encoder.
+# =========================================================
+class FrameSink:
+    def __init__(
+        self,
+        out_path: str,
+        fps: int,
+        size=(W, H),
+        extra_args: Optional[list] = None,
+    ):
+        self.path = out_path
+        self.fps = fps
+        self.size = size
+        self.frames = 0
+
+        os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "rgb24",
+            "-s",
+            f"{size[0]}x{size[1]}",
+            "-framerate",
+            str(fps),
+            "-i",
+            "-",
+        ]
+        cmd += extra_args or []
+        cmd += [
+            "-c:v",
+            "libx264",
+            "-pix_fmt",
+            "yuv420p",
+        ]
+        if out_path.endswith(".mp4"):
+            cmd += ["-movflags", "+faststart"]
+        cmd += [out_path]
+
+        print("[SINK] FFmpeg cmd:", " ".join(map(str, cmd)))
+        self.cmd = cmd
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, bufsize=0)
+
+    def write(self, img: Image.Image):
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        if img.size != self.size:
+            raise ValueError(f"Frame size {img.size} != sink size {self.size}")
+        self._write_bytes(img.tobytes())
+        self.frames += 1
+
+    def hold(self, img: Image.Image, count: int):
+        """
+        Emit the same frame `count` times. The image is converted
+        to raw bytes once; ffmpeg just receives the buffer again.
+        """
+        if count <= 0:
+            return
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        if img.size != self.size:
+            raise ValueError(f"Frame size {img.size} != sink size {self.size}")
+        data = img.tobytes()
+        for _ in range(count):
+            self._write_bytes(data)
+        self.frames += count
+
+    def _write_bytes(self, data: bytes):
+        try:
+            self.proc.stdin.write(data)
+        except BrokenPipeError:
+            self.proc.wait()
+            raise subprocess.CalledProcessError(self.proc.returncode, self.cmd)
+
+    def close(self) -> str:
+        if self.proc.stdin and not self.proc.stdin.closed:
+            self.proc.stdin.close()
+        code = self.proc.wait()
+        if code != 0:
+            raise subprocess.CalledProcessError(code, self.cmd)
+        return self.path
+
+    def abort(self):
+        if self.proc.stdin and not self.proc.stdin.closed:
+            try:
+                self.proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        self.proc.kill()
+        self.proc.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+FrameTarget = Union[str, FrameSink]
+
+
+def write_frame(out: FrameTarget, index: int, img: Image.Image, digits: int = 5):
+    """
+    Emit one frame either to a FrameSink (pipe mode) or as a
+    frame_%05d.png file inside a frames directory (legacy mode).
+    """
+    if isinstance(out, FrameSink):
+        out.write(img)
+        return
+
+    img.convert("RGB").save(os.path.join(out, f"frame_{index:0{digits}d}.png"))
+
+
+def hold_frame(
+    out: FrameTarget, start: int, img: Image.Image, count: int, digits: int = 5
+):
+    """
+    Static segment: render once, emit `count` identical frames.
+    PNG mode saves the first frame and hard-links the rest.
+    """
+    if count <= 0:
+        return
+
+    if isinstance(out, FrameSink):
+        out.hold(img, count)
+        return
+
+    first = os.path.join(out, f"frame_{start:0{digits}d}.png")
+    img.convert("RGB").save(first)
+    for i in range(1, count):
+        dst = os.path.join(out, f"frame_{start + i:0{digits}d}.png")
+        try:
+            os.link(first, dst)
+        except OSError:
+            shutil.copyfile(first, dst)
@@ -0,0 +1,94 @@
+from typing import Callable, List, Optional, Tuple
+
+from PIL import Image, ImageDraw
+
+Box = Tuple[int, int, int, int]
+
+
+def union_box(*boxes: Optional[Box]) -> Optional[Box]:
+    boxes = [b for b in boxes if b]
+    if not boxes:
+        return None
+    return (
+        min(b[0] for b in boxes),
+        min(b[1] for b in boxes),
+        max(b[2] for b in boxes),
+        max(b[3] for b in boxes),
+    )
+
+
+# =========================================================
+# LAYERED CANVAS
+# Static layers are composed once into `base`. Each frame,
+# only the rectangles dirtied by the previous frame's dynamic
+# layers are restored from base, then dynamic layers redraw.
+# =========================================================
+class LayeredCanvas:
+    def __init__(self, base: Image.Image):
+        self.base = base
+        self.base_draw = ImageDraw.Draw(base)
+        self.frame = base.copy()
+        self.draw = ImageDraw.Draw(self.frame)
+        self._dirty: List[Box] = []
+
+    def mark(self, box: Optional[Box]):
+        if not box:
+            return
+        w, h = self.frame.size
+        x0, y0, x1, y1 = (int(v) for v in box)
+        x0, y0 = max(0, x0 - 1), max(0, y0 - 1)
+        x1, y1 = min(w, x1 + 1), min(h, y1 + 1)
+        if x0 < x1 and y0 < y1:
+            self._dirty.append((x0, y0, x1, y1))
+
+    def begin(self) -> Image.Image:
+        """
+        Start a new frame: undo last frame's dynamic pixels
+        (and pick up anything baked into base since).
+        """
+        for box in self._dirty:
+            self.frame.paste(self.base.crop(box), box[:2])
+        self._dirty = []
+        return self.frame
+
+
+# =========================================================
+# ANIMATED LAYERS
+# A layer animates from `start` until `settle`, after which
+# it never moves again and is baked into the canvas base.
+# =========================================================
+DrawFn = Callable[[Image.Image, ImageDraw.ImageDraw, int], Optional[Box]]
+
+
+class Layer:
+    __slots__ = ("start", "settle", "draw", "baked")
+
+    def __init__(self, start: int, settle: int, draw: DrawFn):
+        self.start = start
+        self.settle = settle
+        self.draw = draw
+        self.baked = False
+
+
+def render_layers(
+    canvas: LayeredCanvas, layers: List[Layer], frame: int
+) -> Image.Image:
+    """
+    Bake settled layers (in z-order, only while every layer below
+    is already baked), then redraw the still-moving ones on top.
+    """
+    for layer in layers:
+        if layer.baked:
+            continue
+        if frame < layer.settle:
+            break
+        canvas.mark(layer.draw(canvas.base, canvas.base_draw, frame))
+        layer.baked = True
+
+    img = canvas.begin()
+    for layer in layers:
+        if layer.baked or frame < layer.start:
+            continue
+        canvas.mark(layer.draw(img, canvas.draw, frame))
+
+    return img
@@ -0,0 +1,53 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+from .scene_renderer import render_scene
+
+
+def scene_offsets(scenes: list) -> List[Tuple[dict, int]]:
+    """
+    Global start frame of every scene. Renderers always emit exactly
+    scene["frames"] frames, so offsets are known before rendering.
+    """
+    out = []
+    start = 0
+    for scene in scenes:
+        out.append((scene, start))
+        start += scene["frames"]
+    return out
+
+
+def _render_job(job) -> Tuple[str, int]:
+    scene, start, frames_dir, episode = job
+    used = render_scene(scene, start, frames_dir, episode)
+    if used != scene["frames"]:
+        raise RuntimeError(
+            f"Scene {scene['type']} rendered {used} frames, expected {scene['frames']}"
+        )
+    return scene["type"], used
+
+
+def render_scenes_parallel(
+    scenes: list, episode: dict, frames_dir: str, workers: int = 0
+) -> int:
+    """
+    Fan scenes out to a process pool. Each worker writes
+    frame_%05d.png at its scene's global offset, so output
+    order is deterministic regardless of completion order.
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = [
+        (scene, start, frames_dir, episode) for scene, start in scene_offsets(scenes)
+    ]
+
+    # longest scenes first so the pool drains evenly
+    jobs.sort(key=lambda j: j[0]["frames"], reverse=True)
+
+    total = 0
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs) or 1)) as pool:
+        for kind, used in pool.map(_render_job, jobs):
+            total += used
+            print(f"  Rendered {kind} -> {used} frames")
+
+    return total
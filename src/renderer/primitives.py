@@ -0,0 +1,123 @@
+from functools import lru_cache
+from typing import Tuple
+
+from PIL import Image, ImageDraw
+
+try:
+    import numpy as np
+except ImportError:  # optional; PIL fallback below
+    np = None
+
+RGB = Tuple[int, int, int]
+RGBA = Tuple[int, int, int, int]
+Box = Tuple[int, int, int, int]
+
+
+# =========================================================
+# GRADIENTS
+# Built once per (size, colors) with NumPy broadcasting
+# instead of one draw.line per row. Cached images are
+# shared: paste them or .copy() before drawing.
+# =========================================================
+@lru_cache(maxsize=32)
+def vertical_gradient(
+    size: Tuple[int, int], top: RGB, bottom: RGB, inclusive: bool = True
+) -> Image.Image:
+    """
+    inclusive=True  -> t = y / (h - 1)  (bottom row is exactly `bottom`)
+    inclusive=False -> t = y / h
+    """
+    w, h = size
+    denom = (h - 1) if inclusive else h
+
+    if np is not None:
+        t = np.arange(h, dtype=np.float64) / denom
+        column = np.stack(
+            [(top[c] + (bottom[c] - top[c]) * t).astype(np.uint8) for c in range(3)],
+            axis=1,
+        )
+        rows = np.broadcast_to(column[:, None, :], (h, w, 3))
+        return Image.fromarray(np.ascontiguousarray(rows), "RGB")
+
+    column = Image.new("RGB", (1, h))
+    column.putdata(
+        [
+            tuple(int(top[c] + (bottom[c] - top[c]) * (y / denom)) for c in range(3))
+            for y in range(h)
+        ]
+    )
+    return column.resize((w, h), Image.NEAREST)
+
+
+# =========================================================
+# CONSTANT-COLOR BLENDING
+# Blending a flat color at a fixed alpha over an opaque image
+# is a per-channel function of the destination value, so it
+# reduces to a 256-entry lookup table per channel. The tables
+# are produced by PIL itself on a ramp, which keeps the result
+# bit-identical to alpha_composite / paste-with-mask.
+# =========================================================
+def _ramp(alpha_ramp: bool) -> Image.Image:
+    ramp = Image.new("RGBA", (256, 1))
+    ramp.putdata([(v, v, v, v if alpha_ramp else 255) for v in range(256)])
+    return ramp
+
+
+def _lut(img: Image.Image) -> list:
+    lut = []
+    for band in img.split():
+        lut += list(band.getdata())
+    return lut
+
+
+@lru_cache(maxsize=64)
+def composite_lut(rgba: RGBA) -> list:
+    """LUT equivalent of Image.alpha_composite(opaque, flat(rgba))."""
+    out = Image.alpha_composite(_ramp(False), Image.new("RGBA", (256, 1), rgba))
+    lut = _lut(out)
+    return lut[:768] + list(range(256))
+
+
+@lru_cache(maxsize=64)
+def paste_lut(rgba: RGBA) -> list:
+    """LUT equivalent of img.paste(flat(rgba), pos, flat(rgba))."""
+    ramp = _ramp(True)
+    card = Image.new("RGBA", (256, 1), rgba)
+    ramp.paste(card, (0, 0), card)
+    return _lut(ramp)
+
+
+def overlay(img: Image.Image, rgba: RGBA) -> Image.Image:
+    """Full-frame flat overlay, e.g. the dark tint over backgrounds."""
+    return img.convert("RGBA").point(composite_lut(rgba))
+
+
+def blend_rect(img: Image.Image, box: Box, rgba: RGBA):
+    """
+    In-place glass panel: same pixels as pasting a flat RGBA card
+    with itself as the mask, but only the panel region is touched.
+    """
+    region = img.crop(box).point(paste_lut(rgba))
+    img.paste(region, box[:2])
+
+
+@lru_cache(maxsize=32)
+def rounded_mask(size: Tuple[int, int], radius: int) -> Image.Image:
+    w, h = size
+    mask = Image.new("L", (w, h), 0)
+    ImageDraw.Draw(mask).rounded_rectangle(
+        (0, 0, w - 1, h - 1), radius=radius, fill=255
+    )
+    return mask
+
+
+def composite_rounded_rect(img: Image.Image, box: Box, radius: int, rgba: RGBA):
+    """
+    In-place equivalent of alpha-compositing a full-size layer holding
+    one rounded rectangle, without allocating a full-frame layer.
+    `box` is inclusive, like ImageDraw.rounded_rectangle.
+    """
+    x0, y0, x1, y1 = box
+    w, h = x1 - x0 + 1, y1 - y0 + 1
+    region = img.crop((x0, y0, x0 + w, y0 + h)).point(composite_lut(rgba))
+    img.paste(region, (x0, y0), rounded_mask((w, h), radius))
@@ -1,16 +1,25 @@
+import hashlib
 import os
 import random
+import re
 import shutil
 import subprocess
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Optional, Dict, Tuple, Union
 
 from PIL import Image, ImageDraw, ImageFont
 
-from .watermark import apply_watermark
-from ..config import OUTPUT_DIR, FONTS_DIR, MUSIC_DIR
+from .watermark import apply_watermark, watermark_box
+from ..config import OUTPUT_DIR, FONTS_DIR, MUSIC_DIR, CACHE_DIR
+from ..bundles import load_bundle
 from ..utils.text import wrap_lines
 from .timer_overlay import draw_timer
+from .frame_sink import FrameTarget, hold_frame, write_frame
+from .fonts import fit_font, get_font, load_font, text_width
+from .layers import Layer, LayeredCanvas, render_layers, union_box
+from .primitives import composite_rounded_rect, overlay
+from .sprites import blit_text, text_sprite
 
 
 # =========================================================
@@ -113,10 +122,6 @@ def abs_path(p: str) -> str:
     return os.path.abspath(p)
 
 
-def load_font(name: str, size: int) -> ImageFont.FreeTypeFont:
-    return ImageFont.truetype(os.path.join(FONTS_DIR, name), size)
-
-
 def load_logo() -> Optional[Image.Image]:
     if not os.path.isfile(LOGO_PATH):
         return None
@@ -137,83 +142,213 @@ def pick_music() -> Optional[str]:
 # =========================================================
 # BACKGROUND
 # =========================================================
-def get_background(category: Optional[str]) -> Image.Image:
+OVERLAY_ALPHA = 140
+PLATE_CACHE_DIR = os.path.join(CACHE_DIR, "plates")
+
+_plates: Dict[Tuple[str, Tuple[int, int], int], Image.Image] = {}
+
+
+def background_path(category: Optional[str]) -> str:
     key = (category or "general").lower()
     path = os.path.join(BG_DIR, CATEGORY_BG_MAP.get(key, "general.png"))
     if not os.path.isfile(path):
         path = os.path.join(BG_DIR, "general.png")
-    bg = Image.open(path).convert("RGB")
-    return bg.resize((W, H), RESAMPLE)
+    return path
+
 
+def get_background(
+    category: Optional[str], size: Tuple[int, int] = (W, H)
+) -> Image.Image:
+    bg = Image.open(background_path(category)).convert("RGB")
+    return bg.resize(size, RESAMPLE)
 
-def apply_dark_overlay(img: Image.Image) -> Image.Image:
-    overlay = Image.new("RGBA", img.size, (0, 0, 0, 140))
-    return Image.alpha_composite(img.convert("RGBA"), overlay)
+
+def apply_dark_overlay(img: Image.Image, alpha: int = OVERLAY_ALPHA) -> Image.Image:
+    return overlay(img, (0, 0, 0, alpha))
+
+
+def _plate_disk_path(category: str, size: Tuple[int, int], alpha: int) -> str:
+    # asset mtime/size in the key: replacing a background invalidates its plates
+    # category is free text: only a slug goes in the filename, the raw
+    # value is part of the hash
+    src = background_path(category)
+    st = os.stat(src)
+    sig = (
+        f"{category}|{os.path.abspath(src)}|{st.st_mtime_ns}|{st.st_size}"
+        f"|{size}|{alpha}"
+    )
+    digest = hashlib.sha1(sig.encode("utf-8")).hexdigest()[:16]
+    slug = re.sub(r"[^a-z0-9]+", "-", category.lower()).strip("-")[:40] or "plate"
+    return os.path.join(
+        PLATE_CACHE_DIR, f"{slug}_{size[0]}x{size[1]}_a{alpha}_{digest}.png"
+    )
+
+
+def get_background_plate(
+    category: Optional[str],
+    size: Tuple[int, int] = (W, H),
+    alpha: int = OVERLAY_ALPHA,
+) -> Image.Image:
+    """
+    Background resized + darkened, built once per process (and once per
+    asset change on disk). Returns a copy the caller can draw on.
+    """
+    cat = (category or "general").lower()
+    key = (cat, size, alpha)
+
+    plate = _plates.get(key)
+    if plate is None:
+        disk = _plate_disk_path(cat, size, alpha)
+        if os.path.isfile(disk):
+            plate = Image.open(disk).convert("RGBA")
+        else:
+            plate = apply_dark_overlay(get_background(cat, size), alpha)
+            os.makedirs(PLATE_CACHE_DIR, exist_ok=True)
+            tmp = f"{disk}.{os.getpid()}.tmp"
+            plate.save(tmp, format="PNG", compress_level=1)
+            os.replace(tmp, disk)
+        _plates[key] = plate
+
+    return plate.copy()
 
 
 Color = Union[str, Tuple[int, int, int]]
 
 
 def draw_text_shadow(
-    draw: ImageDraw.ImageDraw,
+    img: Image.Image,
     pos: Tuple[int, int],
     text: str,
     font: ImageFont.FreeTypeFont,
     fill: Color = "white",
 ):
+    # one cached sprite, blitted twice: shadow then text
+    sprite = text_sprite(text, font)
     x, y = pos
-    draw.text((x + 2, y + 2), text, font=font, fill=(0, 0, 0))
-    draw.text((x, y), text, font=font, fill=fill)
+    blit_text(img, (x + 2, y + 2), sprite, (0, 0, 0))
+    x0, y0, x1, y1 = blit_text(img, (x, y), sprite, fill)
+    return (x0, y0, x1 + 2, y1 + 2)
 
 
 # =========================================================
 # QUESTION BOX
 # =========================================================
-def draw_question_box(img, draw, text, font, center_y: int):
+def question_box_size(text: str, font_size: int) -> Tuple[int, int]:
     padding = 44
     lines = text.split("\n")
-    box_h = len(lines) * (font.size + 10) + padding * 2
-    box_w = int(W * 0.85)
+    return int(W * 0.85), len(lines) * (font_size + 10) + padding * 2
+
+
+def draw_question_box(img, draw, text, font, center_y: int):
+    box_w, box_h = question_box_size(text, font.size)
 
     x0 = (W - box_w) // 2
     y0 = center_y - box_h // 2
 
-    layer = Image.new("RGBA", img.size)
-    d = ImageDraw.Draw(layer)
-    d.rounded_rectangle(
+    composite_rounded_rect(
+        img,
         (x0, y0, x0 + box_w, y0 + box_h),
         radius=26,
-        fill=(0, 0, 0, 150),
+        rgba=(0, 0, 0, 150),
     )
-    img.alpha_composite(layer)
 
-    draw.multiline_text(
+    text_box = blit_text(
+        img,
         (W // 2, center_y),
-        text,
-        font=font,
-        fill="white",
-        anchor="ma",
-        align="center",
-        spacing=10,
+        text_sprite(text, font, anchor="ma", spacing=10, align="center"),
+        "white",
     )
+    return union_box((x0, y0, x0 + box_w, y0 + box_h), text_box)
 
 
 # =========================================================
 # OPTIONS
 # =========================================================
 def fit_text(draw, text, font_path, max_size, min_size, max_width):
-    for size in range(max_size, min_size - 1, -2):
-        font = ImageFont.truetype(font_path, size)
-        if draw.textlength(text, font=font) <= max_width:
-            return font
-    return ImageFont.truetype(font_path, min_size)
+    return fit_font(text, font_path, max_size, min_size, max_width)
+
+
+# =========================================================
+# LAYOUT
+# Per-question text layout. Precomputed into the question's
+# bundle by `python -m src.prepare`; computed on the fly
+# otherwise.
+# =========================================================
+QUESTION_WRAP = 40
+QUESTION_FONT = ("Inter-Bold.ttf", 56)
+OPTION_FONT = "Inter-Regular.ttf"
+OPTION_FIT = (44, 30, 520)  # max size, min size, max width
+
+
+def compute_layout(q: dict) -> Dict[str, Any]:
+    question = wrap_lines(q["question"], QUESTION_WRAP)
+    options = q.get("options", [])
+    labels = [f"{chr(65 + i)}. {opt}" for i, opt in enumerate(options)]
+    opt_path = os.path.join(FONTS_DIR, OPTION_FONT)
+    fonts = [fit_font(label, opt_path, *OPTION_FIT) for label in labels]
+
+    return {
+        "question": question,
+        "labels": labels,
+        "option_sizes": [font.size for font in fonts],
+    }
+
+
+@lru_cache(maxsize=1)
+def layout_inputs() -> tuple:
+    """
+    Everything compute_layout depends on besides the question: part
+    of the bundle key, so changing a constant or font invalidates.
+    """
+    fonts = []
+    for name in (QUESTION_FONT[0], OPTION_FONT):
+        try:
+            st = os.stat(os.path.join(FONTS_DIR, name))
+            fonts.append((name, st.st_size, st.st_mtime_ns))
+        except FileNotFoundError:
+            fonts.append((name, None, None))
+    return (QUESTION_WRAP, QUESTION_FONT, OPTION_FONT, OPTION_FIT, tuple(fonts))
+
+
+def question_layout(q: dict) -> Dict[str, Any]:
+    bundle = load_bundle(q)
+    if bundle is not None:
+        return bundle["layout"]
+    return compute_layout(q)
+
+
+def question_text_runs(q: dict, layout: Dict[str, Any]) -> list:
+    """
+    (text, font, anchor, spacing, align) for every per-question string
+    the quiz scenes draw; `prepare` pre-rasterizes these as sprites.
+    """
+    opt_path = os.path.join(FONTS_DIR, OPTION_FONT)
+    category = (q.get("category") or "general").upper()
+    difficulty = (q.get("difficulty") or "easy").upper()
+
+    runs = [
+        (layout["question"], load_font(*QUESTION_FONT), "ma", 10, "center"),
+        (
+            f"{category}   •   {difficulty}",
+            load_font("Inter-Bold.ttf", 64),
+            "ma",
+            4,
+            "left",
+        ),
+        (q["answer"], load_font("Inter-Bold.ttf", 90), "mm", 4, "left"),
+        ("Correct Answer", load_font(OPTION_FONT, 50), "mm", 4, "left"),
+    ]
+    for label, size in zip(layout["labels"], layout["option_sizes"]):
+        runs.append((label, load_font(OPTION_FONT, 42), None, 4, "left"))
+        runs.append((label, get_font(opt_path, size), None, 4, "left"))
+    return runs
 
 
 def preload_option_images(options):
     return {v: get_cached_image(v) or fetch_and_cache_image(v) for v in options}
 
 
-def draw_header(draw, q):
+def draw_header(img, draw, q):
     category = (q.get("category") or "general").upper()
     difficulty = (q.get("difficulty") or "easy").upper()
 
@@ -224,7 +359,7 @@ def draw_header(draw, q):
     # background pill
     padding_x = 60
     padding_y = 30
-    w = draw.textlength(text, font=font)
+    w = text_width(text, font)
     h = font.size
 
     x0 = (W - w) // 2 - padding_x
@@ -234,48 +369,41 @@ def draw_header(draw, q):
 
     draw.rounded_rectangle((x0, y0, x1, y1), radius=40, fill=(0, 0, 0, 180))
 
-    draw.text(
+    blit_text(
+        img,
         (W // 2, y0 + padding_y // 2),
-        text,
-        fill=(255, 255, 255),
-        anchor="ma",
-        font=font,
+        text_sprite(text, font, anchor="ma"),
+        (255, 255, 255),
     )
 
 
 # =========================================================
 # QUESTION SCREEN (STATIC PER FRAME)
 # =========================================================
-def draw_question_frame(frames_dir: str, start_frame: int, q: dict, total_frames: int):
-    font_question = load_font("Inter-Bold.ttf", 56)
-    font_opt = load_font("Inter-Regular.ttf", 42)
-
-    question = wrap_lines(q["question"], 40)
-    question = "\n".join(question) if isinstance(question, list) else question
+def draw_question_frame(out: FrameTarget, start_frame: int, q: dict, total_frames: int):
+    font_question = load_font(*QUESTION_FONT)
+    font_opt = load_font(OPTION_FONT, 42)
 
-    options = q.get("options", [])
-
-    for i in range(total_frames):
-        frame = start_frame + i
-
-        img = apply_dark_overlay(get_background(q.get("category")))
-        draw = ImageDraw.Draw(img)
+    layout = question_layout(q)
+    question = layout["question"]
 
-        # Question
-        draw_question_box(img, draw, question, font_question, 550)
-        draw_header(draw, q)
+    # Static layers: composed once per scene
+    img = get_background_plate(q.get("category"))
+    draw = ImageDraw.Draw(img)
 
-        # Options
-        for idx, opt in enumerate(options):
-            label = f"{chr(65+idx)}. {opt}"
-            draw_text_shadow(draw, (220, 950 + idx * 120), label, font_opt)
+    draw_question_box(img, draw, question, font_question, 550)
+    draw_header(img, draw, q)
 
-        # TIMER (must be after draw exists)
-        from .timer_overlay import draw_timer
+    for idx, label in enumerate(layout["labels"]):
+        draw_text_shadow(img, (220, 950 + idx * 120), label, font_opt)
 
-        draw_timer(draw, i, total_frames, W, H)
+    # Dynamic layer: only the timer region is redrawn per frame
+    canvas = LayeredCanvas(img)
 
-        img.convert("RGB").save(os.path.join(frames_dir, f"frame_{frame:05d}.png"))
+    for i in range(total_frames):
+        frame_img = canvas.begin()
+        canvas.mark(draw_timer(canvas.draw, i, total_frames, W, H))
+        write_frame(out, start_frame + i, frame_img)
 
     return total_frames
 
@@ -283,41 +411,37 @@ def draw_question_frame(frames_dir: str, start_frame: int, q: dict, total_frames
 # =========================================================
 # ANSWER SCREEN
 # =========================================================
-def draw_answer_frame(frames_dir: str, start_frame: int, q: dict, total_frames: int):
+def draw_answer_frame(out: FrameTarget, start_frame: int, q: dict, total_frames: int):
     font_big = load_font("Inter-Bold.ttf", 90)
     font_small = load_font("Inter-Regular.ttf", 50)
 
     answer = q["answer"]
 
-    for i in range(total_frames):
-        frame = start_frame + i
-
-        img = apply_dark_overlay(get_background(q.get("category")))
-        draw = ImageDraw.Draw(img)
+    # Two static segments: blank lead-in, then the reveal.
+    # Each is rendered once and held.
+    lead_in = min(total_frames, int(0.2 * 30))
 
-        if i < int(0.2 * 30):
-            img.convert("RGB").save(os.path.join(frames_dir, f"frame_{frame:05d}.png"))
-            continue
+    img = get_background_plate(q.get("category"))
+    hold_frame(out, start_frame, img, lead_in)
 
+    if lead_in < total_frames:
         # Title
-        draw.text(
+        blit_text(
+            img,
             (W // 2, H // 2 - 120),
-            "Correct Answer",
-            font=font_small,
-            fill=(255, 255, 255),
-            anchor="mm",
+            text_sprite("Correct Answer", font_small, anchor="mm"),
+            (255, 255, 255),
         )
 
         # Answer centered
-        draw.text(
+        blit_text(
+            img,
             (W // 2, H // 2 + 40),
-            answer,
-            font=font_big,
-            fill=(0, 255, 160),
-            anchor="mm",
+            text_sprite(answer, font_big, anchor="mm"),
+            (0, 255, 160),
         )
 
-        img.convert("RGB").save(os.path.join(frames_dir, f"frame_{frame:05d}.png"))
+        hold_frame(out, start_frame + lead_in, img, total_frames - lead_in)
 
     return total_frames
 
@@ -330,7 +454,7 @@ def render_quiz_frames(q: dict, frames_dir: str) -> Dict[str, Any]:
 
     font_header = load_font("Inter-Bold.ttf", 52)
     font_hook = load_font("Inter-Bold.ttf", 60)
-    font_question = load_font("Inter-Bold.ttf", 56)
+    font_question = load_font(*QUESTION_FONT)
     font_comment = load_font("Inter-Regular.ttf", 46)
 
     hook_text = q.get("_episode_hook", "Can you answer all 5?")
@@ -345,8 +469,8 @@ def render_quiz_frames(q: dict, frames_dir: str) -> Dict[str, Any]:
     cat_color = (180, 220, 255)
     diff_color = (255, 200, 80)
 
-    question = wrap_lines(q["question"], 40)
-    question = "\n".join(question) if isinstance(question, list) else question
+    layout = question_layout(q)
+    question = layout["question"]
     question_img_path = None  # wiki images removed
 
     options = q.get("options", [])
@@ -355,91 +479,109 @@ def render_quiz_frames(q: dict, frames_dir: str) -> Dict[str, Any]:
 
     logo = load_logo()
     total_frames = FPS * QUIZ_DURATION
-    opt_font_path = os.path.join(FONTS_DIR, "Inter-Regular.ttf")
+    opt_font_path = os.path.join(FONTS_DIR, OPTION_FONT)
 
-    for frame in range(total_frames):
-        img = apply_dark_overlay(get_background(q.get("category")))
-        draw = ImageDraw.Draw(img)
+    # HEADER
+    def header_layer(img, draw, frame):
+        t = min(1.0, (frame - CAT_DIFF_START) / STEP)
+        y = int(-80 + ease_out(t) * 140)
 
-        # HEADER
-        if frame >= CAT_DIFF_START:
-            t = min(1.0, (frame - CAT_DIFF_START) / STEP)
-            y = int(-80 + ease_out(t) * 140)
-
-            cat_x = W // 2 - 260
-            diff_x = cat_x + int(
-                draw.textlength(category_text + " • ", font=font_header)
-            )
+        cat_x = W // 2 - 260
+        diff_x = cat_x + int(text_width(category_text + " • ", font_header))
 
+        return union_box(
             draw_text_shadow(
-                draw, (cat_x, y), category_text + " • ", font_header, fill=cat_color
-            )
+                img, (cat_x, y), category_text + " • ", font_header, fill=cat_color
+            ),
             draw_text_shadow(
-                draw, (diff_x, y), difficulty_text, font_header, fill=diff_color
-            )
-
-        # HOOK
-        if frame >= HOOK_START:
-            t = min(1.0, (frame - HOOK_START) / STEP)
-            x = int(-400 + ease_out(t) * (W // 2 + 400))
-            draw_text_shadow(
-                draw,
-                (W // 2 - int(draw.textlength(hook_text, font=font_hook)) // 2, 180),
-                hook_text,
-                font_hook,
-                fill=hook_color,
-            )
-
-        # QUESTION
-        if frame >= QUESTION_START:
-            t = min(1.0, (frame - QUESTION_START) / QUESTION_SLIDE_FRAMES)
-            yq = int(-200 + ease_out(t) * 620)
+                img, (diff_x, y), difficulty_text, font_header, fill=diff_color
+            ),
+        )
 
-            if question_img_path and os.path.isfile(question_img_path):
-                try:
-                    qi = Image.open(question_img_path).convert("RGBA")
-                    qi = qi.resize((220, 220), RESAMPLE)
-                    img.paste(qi, (W // 2 - 110, yq - 240), qi)
-                except Exception:
-                    pass
+    # HOOK
+    def hook_layer(img, draw, frame):
+        return draw_text_shadow(
+            img,
+            (W // 2 - int(text_width(hook_text, font_hook)) // 2, 180),
+            hook_text,
+            font_hook,
+            fill=hook_color,
+        )
 
-            draw_question_box(img, draw, question, font_question, yq)
+    # QUESTION
+    def question_layer(img, draw, frame):
+        t = min(1.0, (frame - QUESTION_START) / QUESTION_SLIDE_FRAMES)
+        yq = int(-200 + ease_out(t) * 620)
+
+        image_box = None
+        if question_img_path and os.path.isfile(question_img_path):
+            try:
+                qi = Image.open(question_img_path).convert("RGBA")
+                qi = qi.resize((220, 220), RESAMPLE)
+                img.paste(qi, (W // 2 - 110, yq - 240), qi)
+                image_box = (W // 2 - 110, yq - 240, W // 2 + 110, yq - 20)
+            except Exception:
+                pass
+
+        return union_box(
+            image_box, draw_question_box(img, draw, question, font_question, yq)
+        )
 
-        # OPTIONS
-        for letter, value, idx in option_rows:
-            start = OPTIONS_START + idx * OPTION_STAGGER
-            if frame < start:
-                continue
+    # OPTIONS
+    def option_layer(letter, value, idx):
+        start = OPTIONS_START + idx * OPTION_STAGGER
+        label = layout["labels"][idx]
+        font_opt = get_font(opt_font_path, layout["option_sizes"][idx])
 
+        def draw_option(img, draw, frame):
             t = min(1.0, (frame - start) / STEP)
             base_y = 980 + idx * 110
             y = int(-100 + ease_out(t) * base_y)
 
-            label = f"{letter}. {value}"
-            font_opt = fit_text(draw, label, opt_font_path, 44, 30, 520)
-
+            icon_box = None
             img_path = option_images.get(value)
             if img_path and os.path.isfile(img_path):
                 icon = Image.open(img_path).convert("RGBA").resize((72, 72), RESAMPLE)
                 img.paste(icon, (W // 2 - 320, y), icon)
+                icon_box = (W // 2 - 320, y, W // 2 - 248, y + 72)
 
-            draw_text_shadow(draw, (W // 2 - 220, y + 10), label, font_opt)
-
-        # COMMENT CTA
-        if frame >= int(6.5 * FPS):
-            draw.text(
-                (W // 2, 1450),
-                comment_text,
-                font=font_comment,
-                fill="white",
-                anchor="mm",
+            return union_box(
+                icon_box,
+                draw_text_shadow(img, (W // 2 - 220, y + 10), label, font_opt),
             )
 
+        return Layer(start, start + STEP, draw_option)
+
+    # COMMENT CTA
+    def comment_layer(img, draw, frame):
+        return blit_text(
+            img,
+            (W // 2, 1450),
+            text_sprite(comment_text, font_comment, anchor="mm"),
+            "white",
+        )
+
+    # z-ordered; each layer is baked into the static base once it settles
+    comment_start = int(6.5 * FPS)
+    layers = [
+        Layer(CAT_DIFF_START, CAT_DIFF_START + STEP, header_layer),
+        Layer(HOOK_START, HOOK_START, hook_layer),
+        Layer(QUESTION_START, QUESTION_START + QUESTION_SLIDE_FRAMES, question_layer),
+        *[option_layer(letter, value, idx) for letter, value, idx in option_rows],
+        Layer(comment_start, comment_start, comment_layer),
+    ]
+
+    canvas = LayeredCanvas(get_background_plate(q.get("category")))
+
+    for frame in range(total_frames):
+        img = render_layers(canvas, layers, frame)
+
         # WATERMARK
         if logo:
             img = apply_watermark(img, logo, frame, corner="top-right", opacity=0.7)
+            canvas.mark(watermark_box(frame, corner="top-right"))
 
-        img.convert("RGB").save(os.path.join(frames_dir, f"frame_{frame:04d}.png"))
+        write_frame(frames_dir, frame, img, digits=4)
 
     return {"frames": total_frames - 1, "hook": hook_text, "title": title}
 
@@ -0,0 +1,192 @@
+import glob
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List
+
+from .frame_sink import FrameSink
+from .scene_renderer import render_scene
+from .video_builder import concat_segments
+from ..config import ASSETS_DIR, CACHE_DIR, SCENE_CACHE_MAX_MB
+from ..utils.cache import evict_lru, touch
+
+# bump when scene visuals change in a way the source digest can't see
+RENDERER_VERSION = "1"
+
+SCENE_CACHE_DIR = os.path.join(CACHE_DIR, "scenes")
+PART_MAX_AGE = 3600  # seconds; an in-progress segment is never this stale
+
+
+# =========================================================
+# SEGMENT-PARALLEL ENCODE
+# Every scene is rendered and encoded by its own worker into
+# an MPEG-TS segment. Each segment is a fresh x264 stream, so
+# it starts on an IDR frame and the cut points are GOP-aligned;
+# the segments are then joined with the concat demuxer using
+# stream copy (no re-encode).
+# =========================================================
+def encode_scene(job) -> str:
+    scene, episode, out_path, fps, threads = job
+    tmp = f"{out_path}.{os.getpid()}.part"
+
+    extra = ["-f", "mpegts"]
+    if threads:
+        extra += ["-threads", str(threads)]
+    try:
+        sink = FrameSink(tmp, fps, extra_args=extra)
+        with sink:
+            used = render_scene(scene, 0, sink, episode)
+
+        if used != scene["frames"] or sink.frames != scene["frames"]:
+            raise RuntimeError(
+                f"Scene {scene['type']} wrote {sink.frames} frames, "
+                f"expected {scene['frames']}"
+            )
+
+        os.replace(tmp, out_path)
+    except BaseException:
+        _unlink(tmp)
+        raise
+    return out_path
+
+
+def _unlink(path: str):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def sweep_partials(max_age: float = PART_MAX_AGE):
+    """
+    Drop .part files left by encodes that were killed outright.
+    Only old ones: a live encode in another process touches its
+    file every few frames.
+    """
+    cutoff = time.time() - max_age
+    for path in glob.glob(os.path.join(SCENE_CACHE_DIR, "*.part")):
+        try:
+            if os.stat(path).st_mtime < cutoff:
+                _unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+# =========================================================
+# SCENE CACHE
+# A segment is keyed on everything that can change its pixels:
+# scene type/length, the episode content the scene draws, the
+# assets on disk, the renderer sources and the encode settings.
+# Unchanged scenes are reused across re-runs and episodes.
+# =========================================================
+@lru_cache(maxsize=1)
+def _static_fingerprint() -> str:
+    h = hashlib.sha256(RENDERER_VERSION.encode("utf-8"))
+
+    renderer_dir = os.path.dirname(os.path.abspath(__file__))
+    for path in sorted(glob.glob(os.path.join(renderer_dir, "*.py"))):
+        with open(path, "rb") as f:
+            h.update(f.read())
+
+    for sub in ("fonts", "backgrounds", "icons", "logo.png"):
+        root = os.path.join(ASSETS_DIR, sub)
+        if os.path.isfile(root):
+            paths = [root]
+        else:
+            paths = sorted(glob.glob(os.path.join(root, "**", "*"), recursive=True))
+
+        for path in paths:
+            if not os.path.isfile(path):
+                continue
+            st = os.stat(path)
+            rel = os.path.relpath(path, ASSETS_DIR)
+            h.update(f"{rel}|{st.st_mtime_ns}|{st.st_size}".encode("utf-8"))
+
+    return h.hexdigest()
+
+
+def scene_inputs(scene: dict, episode: dict) -> dict:
+    t = scene["type"]
+    inputs = {"type": t, "frames": scene["frames"]}
+
+    if t == "hook":
+        inputs["hook"] = episode["hook"]
+    elif t.startswith("q") or t.startswith("a"):
+        inputs["question"] = episode["questions"][int(t[1:]) - 1]
+    elif t == "outro":
+        inputs["outro"] = episode["outro"]
+
+    return inputs
+
+
+def scene_key(scene: dict, episode: dict, fps: int) -> str:
+    payload = json.dumps(
+        {
+            "inputs": scene_inputs(scene, episode),
+            "fps": fps,
+            "static": _static_fingerprint(),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def scene_cache_path(key: str) -> str:
+    return os.path.join(SCENE_CACHE_DIR, f"{key}.ts")
+
+
+def encode_segments(
+    scenes: list, episode: dict, fps: int, workers: int = 0
+) -> List[str]:
+    """
+    Encode scenes concurrently; returns segment paths in scene order.
+    Scenes already in the cache are reused without rendering.
+    """
+    os.makedirs(SCENE_CACHE_DIR, exist_ok=True)
+
+    paths = []
+    missing = []
+    for scene in scenes:
+        path = scene_cache_path(scene_key(scene, episode, fps))
+        paths.append(path)
+        if touch(path):
+            print(f"  Cached {scene['type']} -> {scene['frames']} frames")
+        else:
+            missing.append((scene, path))
+
+    if missing:
+        workers = min(workers or os.cpu_count() or 1, len(missing))
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        jobs = [(scene, episode, path, fps, threads) for scene, path in missing]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for (scene, _), _ in zip(missing, pool.map(encode_scene, jobs)):
+                print(f"  Encoded {scene['type']} -> {scene['frames']} frames")
+
+    return paths
+
+
+def render_segments(
+    scenes: list,
+    episode: dict,
+    output_dir: str,
+    prefix: str,
+    fps: int,
+    narration: str | None = None,
+    music: str | None = None,
+    workers: int = 0,
+) -> str:
+    paths = encode_segments(scenes, episode, fps, workers)
+    print("Concatenating segments...")
+    out = concat_segments(
+        paths, output_dir, prefix, narration=narration, music=music
+    )
+
+    # segments of this episode were just touched, so they survive the trim
+    sweep_partials()
+    evict_lru(SCENE_CACHE_DIR, SCENE_CACHE_MAX_MB * 1024 * 1024, suffix=".ts")
+    return out
@@ -0,0 +1,135 @@
+import hashlib
+import math
+import os
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+import PIL
+from PIL import Image, ImageDraw, ImageFont
+from PIL.PngImagePlugin import PngInfo
+
+from ..config import CACHE_DIR
+
+SPRITE_CACHE_DIR = os.path.join(CACHE_DIR, "sprites")
+PAD = 4
+
+Box = Tuple[int, int, int, int]
+
+
+class TextSprite(NamedTuple):
+    mask: Image.Image   # "L" coverage, exactly what draw.text would blend
+    dx: int             # mask origin relative to the text anchor point
+    dy: int
+    bbox: Box           # textbbox relative to the anchor point
+
+
+# =========================================================
+# TEXT SPRITES
+# A text run is rasterized through FreeType once into a coverage
+# mask. Pasting a flat fill through that mask is the same
+# operation draw.text performs, so blits are pixel-identical to
+# drawing the text, at any integer position. The fill is applied
+# at blit time, so one mask serves every color (and the shadow).
+# =========================================================
+def _layout_kwargs(text, anchor, spacing, align) -> dict:
+    kwargs = {"anchor": anchor}
+    if "\n" in text:
+        kwargs.update(spacing=spacing, align=align)
+    return kwargs
+
+
+def sprite_key(
+    text: str, font: ImageFont.FreeTypeFont, anchor, spacing, align
+) -> str:
+    raw = "\x1f".join(
+        [
+            PIL.__version__,
+            os.path.basename(font.path),
+            str(font.size),
+            str(anchor),
+            str(spacing),
+            align,
+            text,
+        ]
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _disk_path(key: str) -> str:
+    return os.path.join(SPRITE_CACHE_DIR, key[:2], f"{key}.png")
+
+
+def _rasterize(text, font, anchor, spacing, align) -> TextSprite:
+    kwargs = _layout_kwargs(text, anchor, spacing, align)
+    probe = ImageDraw.Draw(Image.new("L", (1, 1)))
+    bbox = probe.textbbox((0, 0), text, font=font, **kwargs)
+
+    # integer shift keeps sub-pixel glyph placement identical
+    dx = math.floor(bbox[0]) - PAD
+    dy = math.floor(bbox[1]) - PAD
+    w = math.ceil(bbox[2]) - dx + PAD
+    h = math.ceil(bbox[3]) - dy + PAD
+
+    mask = Image.new("L", (w, h), 0)
+    ImageDraw.Draw(mask).text((-dx, -dy), text, font=font, fill=255, **kwargs)
+    return TextSprite(mask, dx, dy, bbox)
+
+
+def _load(path: str) -> Optional[TextSprite]:
+    try:
+        with Image.open(path) as im:
+            im.load()
+            meta = [int(v) for v in im.info["sprite"].split(",")]
+            mask = im.convert("L")
+    except (FileNotFoundError, KeyError, ValueError, OSError):
+        return None
+    return TextSprite(mask, meta[0], meta[1], tuple(meta[2:6]))
+
+
+def _save(path: str, sprite: TextSprite):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    info = PngInfo()
+    info.add_text(
+        "sprite", ",".join(str(int(v)) for v in (sprite.dx, sprite.dy, *sprite.bbox))
+    )
+    tmp = f"{path}.{os.getpid()}.tmp"
+    sprite.mask.save(tmp, format="PNG", pnginfo=info, compress_level=1)
+    os.replace(tmp, path)
+
+
+@lru_cache(maxsize=2048)
+def text_sprite(
+    text: str,
+    font: ImageFont.FreeTypeFont,
+    anchor: Optional[str] = None,
+    spacing: int = 4,
+    align: str = "left",
+    persist: bool = False,
+) -> TextSprite:
+    """
+    Mask for `text` as draw.text/multiline_text would lay it out.
+    persist=True also keeps it in the on-disk sprite cache
+    (populated by `python -m src.prepare`).
+    """
+    key = sprite_key(text, font, anchor, spacing, align)
+    path = _disk_path(key)
+
+    sprite = _load(path)
+    if sprite is not None:
+        return sprite
+
+    sprite = _rasterize(text, font, anchor, spacing, align)
+    # the disk format stores integer boxes only
+    if persist and all(float(v).is_integer() for v in sprite.bbox):
+        _save(path, sprite)
+    return sprite
+
+
+def blit_text(img: Image.Image, pos: Tuple[int, int], sprite: TextSprite, fill) -> Box:
+    """Paste `fill` through the sprite mask; returns the text bbox."""
+    x, y = pos
+    w, h = sprite.mask.size
+    left, top = x + sprite.dx, y + sprite.dy
+    img.paste(fill, (left, top, left + w, top + h), sprite.mask)
+    x0, y0, x1, y1 = sprite.bbox
+    return (x + x0, y + y0, x + x1, y + y1)
@@ -11,6 +11,7 @@ def draw_timer(draw, frame_index, total_frames, width, height):
         fill=(255,255,255),
         anchor="mm"
     )
+    tx0, ty0, tx1, ty1 = draw.textbbox((width//2, 250), str(seconds), anchor="mm")
 
     # progress bar
     bar_w = int(width * 0.7)
@@ -22,3 +23,6 @@ def draw_timer(draw, frame_index, total_frames, width, height):
 
     draw.rectangle((x0, y, x0+bar_w, y+14), fill=(60,60,60))
     draw.rectangle((x0, y, x0+current_w, y+14), fill=(0,220,255))
+
+    # dirty region, for layered rendering
+    return (min(tx0, x0), min(ty0, y), max(tx1, x0+bar_w+1), max(ty1, y+15))
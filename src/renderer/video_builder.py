@@ -1,6 +1,61 @@
 import os
 import subprocess
 from datetime import datetime
+from typing import List, Optional
+
+from .frame_sink import FrameSink
+from ..config import MUSIC_VOLUME
+
+
+def _output_path(output_dir: str, prefix: str) -> str:
+    os.makedirs(output_dir, exist_ok=True)
+    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(output_dir, f"{prefix}_{ts}.mp4")
+
+
+def audio_args(
+    narration: Optional[str], music: Optional[str], first_input: int = 1
+) -> List[str]:
+    """
+    Extra ffmpeg inputs + output options that mux narration and an
+    optional music bed into the video in the same pass. Music is looped,
+    lowered to MUSIC_VOLUME and ducked under the narration with a
+    sidechain compressor; the mix lasts as long as the narration.
+    """
+    if not narration and not music:
+        return []
+
+    args: List[str] = []
+    codec = ["-c:a", "aac", "-b:a", "192k"]
+
+    if narration and not music:
+        args += ["-i", narration]
+        return args + ["-map", "0:v", "-map", f"{first_input}:a"] + codec
+
+    if music and not narration:
+        args += ["-stream_loop", "-1", "-i", music]
+        return args + [
+            "-map", "0:v",
+            "-map", f"{first_input}:a",
+            "-af", f"volume={MUSIC_VOLUME}",
+            "-shortest",
+        ] + codec
+
+    n, m = first_input, first_input + 1
+    args += ["-i", narration, "-stream_loop", "-1", "-i", music]
+    graph = (
+        f"[{n}:a]asplit=2[narr][key];"
+        f"[{m}:a]volume={MUSIC_VOLUME}[bed];"
+        "[bed][key]sidechaincompress="
+        "threshold=0.03:ratio=8:attack=20:release=400[ducked];"
+        "[narr][ducked]amix=inputs=2:duration=first:dropout_transition=0,"
+        "volume=2[aout]"
+    )
+    return args + [
+        "-filter_complex", graph,
+        "-map", "0:v",
+        "-map", "[aout]",
+    ] + codec
 
 
 def build_video(
@@ -9,11 +64,9 @@ def build_video(
     fps: int,
     music: str | None,
     prefix: str,
+    narration: str | None = None,
 ) -> str:
-    os.makedirs(output_dir, exist_ok=True)
-
-    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    out = os.path.join(output_dir, f"{prefix}_{ts}.mp4")
+    out = _output_path(output_dir, prefix)
 
     frames_input = os.path.join(frames_dir, "frame_%05d.png")
 
@@ -26,8 +79,7 @@ def build_video(
         frames_input,
     ]
 
-    if music:
-        cmd += ["-i", music, "-shortest", "-af", "volume=0.18"]
+    cmd += audio_args(narration, music)
 
     cmd += [
         "-c:v",
@@ -43,3 +95,53 @@ def build_video(
     subprocess.run(cmd, check=True)
 
     return out
+
+
+def open_video_sink(
+    output_dir: str,
+    fps: int,
+    prefix: str,
+    narration: str | None = None,
+    music: str | None = None,
+) -> FrameSink:
+    """
+    Pipe-mode counterpart of build_video: renderers write frames
+    into the returned sink, sink.close() returns the mp4 path.
+    """
+    return FrameSink(
+        _output_path(output_dir, prefix),
+        fps,
+        extra_args=audio_args(narration, music),
+    )
+
+
+def concat_segments(
+    segments: List[str],
+    output_dir: str,
+    prefix: str,
+    narration: str | None = None,
+    music: str | None = None,
+) -> str:
+    """
+    Join encoded segments with the concat demuxer. Video is stream-copied;
+    audio is muxed in the same pass.
+    """
+    out = _output_path(output_dir, prefix)
+    list_path = f"{out}.segments.txt"
+
+    with open(list_path, "w", encoding="utf-8") as f:
+        for seg in segments:
+            escaped = os.path.abspath(seg).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+    cmd = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", list_path]
+    cmd += audio_args(narration, music)
+    cmd += ["-c:v", "copy", "-movflags", "+faststart", out]
+
+    print("[BUILD] FFmpeg cmd:", " ".join(map(str, cmd)))
+    try:
+        subprocess.run(cmd, check=True)
+    finally:
+        os.remove(list_path)
+
+    return out
@@ -16,11 +16,7 @@ def apply_watermark(
     Adds a subtle animated watermark logo to a frame.
     """
 
-    # --- animation ---
-    drift = int(6 * math.sin(frame / 18))
-    scale = 0.97 + 0.03 * math.sin(frame / 24)
-
-    size = int(120 * scale)
+    size, x, y = watermark_geometry(frame, corner)
     wm = logo.resize((size, size), Image.BICUBIC)
 
     # opacity control
@@ -28,6 +24,21 @@ def apply_watermark(
     alpha = ImageEnhance.Brightness(alpha).enhance(opacity)
     wm.putalpha(alpha)
 
+    base.paste(wm, (x, y), wm)
+    return base
+
+
+def watermark_geometry(frame: int, corner: str = "top-right") -> Tuple[int, int, int]:
+    """
+    (size, x, y) of the animated watermark on a given frame.
+    """
+
+    # --- animation ---
+    drift = int(6 * math.sin(frame / 18))
+    scale = 0.97 + 0.03 * math.sin(frame / 24)
+
+    size = int(120 * scale)
+
     pad = 36
 
     if corner == "top-left":
@@ -43,5 +54,9 @@ def apply_watermark(
         x = W - size - pad + drift
         y = pad
 
-    base.paste(wm, (x, y), wm)
-    return base
+    return size, x, y
+
+
+def watermark_box(frame: int, corner: str = "top-right") -> Tuple[int, int, int, int]:
+    size, x, y = watermark_geometry(frame, corner)
+    return (x, y, x + size, y + size)
@@ -0,0 +1,307 @@
+import hashlib
+import http.client
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .config import CACHE_DIR, UPLOAD_CHUNK_MB, YOUTUBE_UPLOAD_URL
+
+UPLOAD_STATE_DIR = Path(CACHE_DIR) / "uploads"
+CHUNK_ALIGN = 256 * 1024               # protocol requires multiples of 256 KiB
+SESSION_MAX_AGE = 6 * 24 * 3600        # sessions expire after about a week
+
+
+class UploadLimitExceeded(Exception):
+    pass
+
+
+class UploadSessionExpired(Exception):
+    pass
+
+
+def chunk_bytes(mb: float = UPLOAD_CHUNK_MB) -> int:
+    size = int(mb * 1024 * 1024)
+    return max(CHUNK_ALIGN, size - size % CHUNK_ALIGN)
+
+
+# =========================================================
+# SESSION STATE
+# The session URI and confirmed offset are written to disk
+# after every chunk, so a new process continues mid-file.
+# Keyed by the file's identity: a re-render gets a new session.
+# =========================================================
+def state_path(video_path: str) -> Path:
+    st = os.stat(video_path)
+    ident = f"{os.path.realpath(video_path)}|{st.st_size}|{st.st_mtime_ns}"
+    key = hashlib.sha256(ident.encode()).hexdigest()[:32]
+    return UPLOAD_STATE_DIR / f"{key}.json"
+
+
+def load_state(path: Path) -> Optional[dict]:
+    try:
+        state = json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+    if time.time() - state.get("created_at", 0) > SESSION_MAX_AGE:
+        return None
+    return state
+
+
+def save_state(path: Path, state: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(state))
+    os.replace(tmp, path)
+
+
+def clear_state(path: Path):
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _next_offset(headers) -> int:
+    # "Range: bytes=0-1048575" -> 1048576; no header -> nothing stored yet
+    rng = headers.get("Range")
+    if not rng:
+        return 0
+    return int(rng.rsplit("-", 1)[1]) + 1
+
+
+def _error_reason(body: bytes) -> str:
+    try:
+        return json.loads(body)["error"]["errors"][0].get("reason", "")
+    except Exception:
+        return ""
+
+
+# =========================================================
+# RESUMABLE UPLOAD
+# Plain implementation of the resumable upload protocol:
+#   POST endpoint          -> Location: session URI
+#   PUT  session (chunk)   -> 308 + Range, or 200/201 + resource
+#   PUT  session bytes */N -> where did we get to?
+# One keep-alive connection is reused for every chunk.
+# =========================================================
+class ResumableUpload:
+    def __init__(
+        self,
+        video_path: str,
+        metadata: dict,
+        auth: Callable[[], str],
+        endpoint: str = YOUTUBE_UPLOAD_URL,
+        chunk_size: int = 0,
+        mimetype: str = "video/mp4",
+        max_retries: int = 6,
+    ):
+        """
+        `auth()` returns a current access token; it is called per request
+        so a long upload survives a token refresh.
+        """
+        self.video_path = video_path
+        self.metadata = metadata
+        self.auth = auth
+        self.endpoint = endpoint
+        self.chunk_size = chunk_size or chunk_bytes()
+        self.mimetype = mimetype
+        self.max_retries = max_retries
+        self.total = os.path.getsize(video_path)
+        self.state_file = state_path(video_path)
+        self._conn = None
+        self._netloc = None
+
+    # ---------- http ----------
+    def _request(
+        self, method, url, body=b"", headers=None
+    ) -> Tuple[int, dict, bytes]:
+        parts = urlsplit(url)
+        netloc = (parts.scheme, parts.netloc)
+        if self._conn is None or self._netloc != netloc:
+            self.close()
+            cls = (
+                http.client.HTTPSConnection
+                if parts.scheme == "https"
+                else http.client.HTTPConnection
+            )
+            self._conn = cls(parts.netloc, timeout=120)
+            self._netloc = netloc
+
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        hdrs = {"Authorization": f"Bearer {self.auth()}"}
+        hdrs.update(headers or {})
+        try:
+            self._conn.request(method, path or "/", body=body, headers=hdrs)
+            res = self._conn.getresponse()
+            return res.status, dict(res.getheaders()), res.read()
+        except (OSError, http.client.HTTPException):
+            # drop the broken connection; caller decides whether to retry
+            self.close()
+            raise
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ---------- protocol ----------
+    def start(self) -> str:
+        body = json.dumps(self.metadata).encode("utf-8")
+        status, headers, data = self._request(
+            "POST",
+            self.endpoint,
+            body,
+            {
+                "Content-Type": "application/json; charset=UTF-8",
+                "X-Upload-Content-Length": str(self.total),
+                "X-Upload-Content-Type": self.mimetype,
+            },
+        )
+        if status == 403 and _error_reason(data) == "uploadLimitExceeded":
+            raise UploadLimitExceeded()
+        if status != 200 or "Location" not in headers:
+            raise http.client.HTTPException(
+                f"upload init failed: {status} {data[:200]!r}"
+            )
+        return headers["Location"]
+
+    def _handle(self, status, headers, data):
+        """Returns (offset, resource); resource is set once complete."""
+        if status in (200, 201):
+            return self.total, json.loads(data)
+        if status == 308:
+            return _next_offset(headers), None
+        if status in (404, 410):
+            raise UploadSessionExpired()
+        if status == 403 and _error_reason(data) == "uploadLimitExceeded":
+            raise UploadLimitExceeded()
+        raise http.client.HTTPException(f"upload failed: {status} {data[:200]!r}")
+
+    def query(self, session: str):
+        return self._handle(
+            *self._request(
+                "PUT",
+                session,
+                b"",
+                {"Content-Length": "0", "Content-Range": f"bytes */{self.total}"},
+            )
+        )
+
+    def send_chunk(self, session: str, f, offset: int):
+        f.seek(offset)
+        chunk = f.read(self.chunk_size)
+        end = offset + len(chunk) - 1
+        return self._handle(
+            *self._request(
+                "PUT",
+                session,
+                chunk,
+                {
+                    "Content-Length": str(len(chunk)),
+                    "Content-Range": f"bytes {offset}-{end}/{self.total}",
+                    "Content-Type": self.mimetype,
+                },
+            )
+        )
+
+    # ---------- driver ----------
+    def _save(self, session: str, offset: int, created_at: float):
+        save_state(
+            self.state_file,
+            {"session": session, "offset": offset, "created_at": created_at},
+        )
+
+    def _session(self):
+        """Stored session if still alive, else a new one."""
+        state = load_state(self.state_file)
+        if state:
+            try:
+                offset, resource = self.query(state["session"])
+                print(f"[youtube] Resuming upload at {offset}/{self.total} bytes")
+                return state["session"], state["created_at"], offset, resource
+            except UploadSessionExpired:
+                print("[youtube] Stored upload session expired — starting over")
+                clear_state(self.state_file)
+
+        session, created_at = self.start(), time.time()
+        self._save(session, 0, created_at)
+        return session, created_at, 0, None
+
+    def _report(self, offset: int, new_offset: int, seconds: float):
+        mb = (new_offset - offset) / (1024 * 1024)
+        rate = mb / seconds if seconds else 0
+        print(
+            f"[youtube] Chunk {offset}-{new_offset - 1}: {mb:.1f} MB "
+            f"in {seconds:.2f}s ({rate:.1f} MB/s) — "
+            f"{int(new_offset * 100 / max(1, self.total))}%"
+        )
+
+    def run(self) -> dict:
+        """
+        Upload (or finish uploading) the file. Returns the created resource.
+        """
+        try:
+            with open(self.video_path, "rb") as f:
+                resource = self._run(f)
+        finally:
+            self.close()
+
+        clear_state(self.state_file)
+        return resource
+
+    def _run(self, f) -> dict:
+        session = None
+        offset = 0
+        resource = None
+        attempt = 0
+        sent = 0
+        started = time.monotonic()
+
+        while resource is None:
+            try:
+                if session is None:
+                    session, created_at, offset, resource = self._session()
+                    continue
+
+                t0 = time.monotonic()
+                new_offset, resource = self.send_chunk(session, f, offset)
+                seconds = time.monotonic() - t0
+            except UploadSessionExpired:
+                clear_state(self.state_file)
+                session = None
+                continue
+            except (OSError, http.client.HTTPException) as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+
+                sleep_s = min(60, (2**attempt) + random.uniform(0.2, 1.5))
+                print(
+                    f"[youtube] Chunk failed "
+                    f"(attempt {attempt}/{self.max_retries}): {e}"
+                )
+                print(f"[youtube] Retrying in {sleep_s:.1f}s...")
+                time.sleep(sleep_s)
+                # resync on the next pass: the server may have kept part of it
+                session = None
+                continue
+
+            attempt = 0
+            sent += new_offset - offset
+            self._report(offset, new_offset, seconds)
+            offset = new_offset
+            if resource is None:
+                self._save(session, offset, created_at)
+
+        elapsed = time.monotonic() - started
+        if sent and elapsed:
+            mb = sent / (1024 * 1024)
+            print(
+                f"[youtube] Sent {mb:.1f} MB in {elapsed:.1f}s "
+                f"({mb / elapsed:.1f} MB/s)"
+            )
+        return resource
@@ -0,0 +1,61 @@
+import json
+import os
+import random
+import string
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from .config import RUNS_DIR
+
+
+# =========================================================
+# RUN MANIFEST
+# One JSON file per pipeline run, rewritten after every stage:
+# output/runs/<run_id>/manifest.json
+# =========================================================
+def new_run_id() -> str:
+    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    suffix = "".join(random.choices(string.ascii_lowercase + string.digits, k=4))
+    return f"{ts}_{suffix}"
+
+
+def run_dir(run_id: str) -> Path:
+    return Path(RUNS_DIR) / run_id
+
+
+def manifest_path(run_id: str) -> Path:
+    return run_dir(run_id) / "manifest.json"
+
+
+def new_manifest(run_id: Optional[str] = None) -> dict:
+    run_id = run_id or new_run_id()
+    return {
+        "run_id": run_id,
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "completed": [],
+    }
+
+
+def save_manifest(manifest: dict):
+    path = manifest_path(manifest["run_id"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    manifest["updated_at"] = datetime.utcnow().isoformat() + "Z"
+
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, ensure_ascii=False))
+    os.replace(tmp, path)
+
+
+def load_manifest(run_id: str) -> dict:
+    path = manifest_path(run_id)
+    if not path.is_file():
+        raise FileNotFoundError(f"No run manifest: {path}")
+    return json.loads(path.read_text())
+
+
+def list_runs() -> List[str]:
+    root = Path(RUNS_DIR)
+    if not root.is_dir():
+        return []
+    return sorted(p.parent.name for p in root.glob("*/manifest.json"))
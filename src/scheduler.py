@@ -0,0 +1,260 @@
+import argparse
+import time
+import traceback
+from typing import Optional
+
+from .config import (
+    RENDER_AHEAD,
+    RENDER_MAX_ATTEMPTS,
+    SCHEDULER_POLL_SECONDS,
+    UPLOAD_EVERY_HOURS,
+)
+from .job_queue import JobQueue, JobWorker
+from .main import run_pipeline
+from .runs import load_manifest, new_manifest
+from .utils.db import connect
+
+UPLOAD_RETRY_SECONDS = 3600
+RENDER_BACKOFF_BASE = 60     # seconds; doubles per consecutive failure
+RENDER_BACKOFF_MAX = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS episodes (
+    run_id      TEXT PRIMARY KEY,
+    status      TEXT NOT NULL,   -- rendering | retry | ready | uploaded | failed
+    created_at  REAL NOT NULL,
+    ready_at    REAL,
+    uploaded_at REAL,
+    error       TEXT,
+    attempts    INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_episodes_status
+    ON episodes (status, created_at);
+
+CREATE TABLE IF NOT EXISTS scheduler_state (
+    key   TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+
+# =========================================================
+# JOB STORE
+# =========================================================
+class EpisodeStore:
+    def __init__(self, path: Optional[str] = None):
+        self.conn = connect(path) if path else connect()
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        rows = self.conn.execute("PRAGMA table_info(episodes)")
+        columns = {r["name"] for r in rows}
+        if "attempts" not in columns:
+            with self.conn:
+                self.conn.execute(
+                    "ALTER TABLE episodes ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0"
+                )
+
+    def add(self, run_id: str):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO episodes (run_id, status, created_at) VALUES (?, ?, ?)",
+                (run_id, "rendering", time.time()),
+            )
+
+    def set_status(self, run_id: str, status: str, error: Optional[str] = None):
+        column = {"ready": "ready_at", "uploaded": "uploaded_at"}.get(status)
+        with self.conn:
+            if column:
+                self.conn.execute(
+                    f"UPDATE episodes SET status = ?, error = NULL, {column} = ? "
+                    "WHERE run_id = ?",
+                    (status, time.time(), run_id),
+                )
+            else:
+                self.conn.execute(
+                    "UPDATE episodes SET status = ?, error = ? WHERE run_id = ?",
+                    (status, error, run_id),
+                )
+
+    def fail(self, run_id: str, error: str) -> str:
+        """
+        Count a failed render: back to "retry", or "failed" for good
+        after RENDER_MAX_ATTEMPTS. Returns the new status.
+        """
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT attempts FROM episodes WHERE run_id = ?", (run_id,)
+            ).fetchone()
+            attempts = (row["attempts"] if row else 0) + 1
+            status = "failed" if attempts >= RENDER_MAX_ATTEMPTS else "retry"
+            self.conn.execute(
+                "UPDATE episodes SET status = ?, error = ?, attempts = ? "
+                "WHERE run_id = ?",
+                (status, error, attempts, run_id),
+            )
+        return status
+
+    def with_status(self, status: str) -> list:
+        rows = self.conn.execute(
+            "SELECT run_id FROM episodes WHERE status = ? ORDER BY created_at",
+            (status,),
+        )
+        return [r["run_id"] for r in rows]
+
+    def count(self, status: str) -> int:
+        row = self.conn.execute(
+            "SELECT COUNT(*) AS n FROM episodes WHERE status = ?", (status,)
+        ).fetchone()
+        return row["n"]
+
+    def get_state(self, key: str, default: float = 0.0) -> float:
+        row = self.conn.execute(
+            "SELECT value FROM scheduler_state WHERE key = ?", (key,)
+        ).fetchone()
+        return row["value"] if row else default
+
+    def set_state(self, key: str, value: float):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO scheduler_state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+
+# =========================================================
+# SCHEDULER
+# Uploads are released on the UPLOAD_EVERY_HOURS cadence;
+# between uploads the box renders until RENDER_AHEAD
+# episodes are waiting. Everything is persisted, so a
+# restarted daemon picks up where it left off. Due post-upload
+# jobs are drained at the top of every tick.
+# A failed render is retried on the same episode (same
+# questions) after an exponential backoff; a new episode is
+# only started once nothing is waiting for a retry.
+# =========================================================
+class Scheduler:
+    def __init__(
+        self,
+        store: EpisodeStore,
+        render_ahead: int = RENDER_AHEAD,
+        jobs: Optional[JobWorker] = None,
+    ):
+        self.store = store
+        self.render_ahead = render_ahead
+        self.jobs = jobs or JobWorker(JobQueue())
+
+    def next_upload_at(self) -> float:
+        return self.store.get_state("next_upload_at", 0.0)
+
+    def next_render_at(self) -> float:
+        return self.store.get_state("next_render_at", 0.0)
+
+    def recover(self):
+        # renders interrupted by a crash/restart resume from their manifest
+        for run_id in self.store.with_status("rendering"):
+            print(f"[scheduler] Resuming interrupted render {run_id}")
+            self.store.set_status(run_id, "retry")
+
+    def tick(self) -> bool:
+        """
+        Do at most one unit of work. Returns False when idle, backing
+        off, or the render just failed.
+        """
+        self.jobs.run_due()
+
+        now = time.time()
+        ready = self.store.with_status("ready")
+
+        if ready and now >= self.next_upload_at():
+            self._upload(ready[0])
+            return True
+
+        if len(ready) < self.render_ahead:
+            if now < self.next_render_at():
+                return False  # backing off after a failed render
+
+            retry = self.store.with_status("retry")
+            if retry:
+                self.store.set_status(retry[0], "rendering")
+                return self._render(retry[0])
+
+            m = new_manifest()
+            self.store.add(m["run_id"])
+            return self._render(m["run_id"], m)
+
+        return False
+
+    def _render(self, run_id: str, m: Optional[dict] = None) -> bool:
+        try:
+            m = m or load_manifest(run_id)
+            m = run_pipeline(m, until="render")
+            error = None if "render" in m["completed"] else "render did not complete"
+        except Exception as e:
+            traceback.print_exc()
+            error = str(e)
+
+        if error is None:
+            self.store.set_status(run_id, "ready")
+            self.store.set_state("render_failures", 0)
+            self.store.set_state("next_render_at", 0.0)
+            print(f"[scheduler] Ready: {run_id} ({m.get('video_path')})")
+            return True
+
+        status = self.store.fail(run_id, error)
+        failures = int(self.store.get_state("render_failures")) + 1
+        delay = min(RENDER_BACKOFF_MAX, RENDER_BACKOFF_BASE * 2 ** (failures - 1))
+        self.store.set_state("render_failures", failures)
+        self.store.set_state("next_render_at", time.time() + delay)
+        print(
+            f"[scheduler] Render of {run_id} failed ({failures} in a row) → "
+            f"{status}; next render in {delay}s"
+        )
+        return False
+
+    def _upload(self, run_id: str):
+        now = time.time()
+        try:
+            m = run_pipeline(load_manifest(run_id))
+            uploaded = "upload" in m["completed"]
+        except Exception:
+            traceback.print_exc()
+            uploaded = False
+
+        if uploaded:
+            self.store.set_status(run_id, "uploaded")
+            self.store.set_state("next_upload_at", now + UPLOAD_EVERY_HOURS * 3600)
+            print(f"[scheduler] Uploaded {run_id}")
+        else:
+            # keep it ready; try again later instead of hammering the API
+            self.store.set_state("next_upload_at", now + UPLOAD_RETRY_SECONDS)
+            print(f"[scheduler] Upload of {run_id} deferred")
+
+    def run_forever(self, poll_seconds: int = SCHEDULER_POLL_SECONDS):
+        self.recover()
+        while True:
+            if not self.tick():
+                time.sleep(poll_seconds)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render ahead of the upload schedule and release uploads"
+    )
+    parser.add_argument("--once", action="store_true", help="run a single tick")
+    parser.add_argument("--ahead", type=int, default=RENDER_AHEAD)
+    args = parser.parse_args(argv)
+
+    scheduler = Scheduler(EpisodeStore(), render_ahead=args.ahead)
+    if args.once:
+        scheduler.recover()
+        scheduler.tick()
+        return
+
+    scheduler.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import queue
+import threading
+import traceback
+from typing import Callable, List
+
+from .config import UPLOAD_QUEUE_DEPTH
+
+_STOP = object()
+
+
+# =========================================================
+# UPLOAD WORKER
+# Uploading is network-bound, rendering is CPU-bound: a single
+# background thread finishes the remaining stages (upload,
+# comment) of rendered runs while the caller renders the next.
+# The queue is bounded, so rendering can only run
+# UPLOAD_QUEUE_DEPTH videos ahead of the uplink.
+# =========================================================
+class UploadWorker:
+    def __init__(self, finish: Callable[[dict], dict], depth: int = UPLOAD_QUEUE_DEPTH):
+        """
+        `finish(manifest)` runs the post-render stages of one run.
+        """
+        self.finish = finish
+        self.queue = queue.Queue(maxsize=max(1, depth))
+        self.done: List[dict] = []
+        self.failed: List[dict] = []
+        self._thread = threading.Thread(target=self._loop, name="uploader", daemon=True)
+        self._thread.start()
+
+    def submit(self, m: dict):
+        """Blocks while the queue is full."""
+        if not self._thread.is_alive():
+            raise RuntimeError("upload worker is not running")
+        self.queue.put(m)
+
+    def _loop(self):
+        while True:
+            m = self.queue.get()
+            try:
+                if m is _STOP:
+                    return
+                print(f"[uploader] Uploading run {m['run_id']}")
+                self.done.append(self.finish(m))
+            except Exception:
+                traceback.print_exc()
+                print(f"[uploader] Run {m['run_id']} failed — resume it later")
+                self.failed.append(m)
+            finally:
+                self.queue.task_done()
+
+    def close(self, drain: bool = True):
+        """
+        drain=True waits for every queued upload. drain=False drops
+        queued runs (their manifests stay resumable) and only waits
+        for the one in flight.
+        """
+        if not drain:
+            while True:
+                try:
+                    m = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                print(f"[uploader] Not uploaded: {m['run_id']} (use --resume)")
+                self.queue.task_done()
+
+        self.queue.put(_STOP)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(drain=exc_type is None)
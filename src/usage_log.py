@@ -0,0 +1,116 @@
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: single-process use only
+    fcntl = None
+
+COMPACT_MIN_LINES = 2000
+
+
+# =========================================================
+# USAGE LOG
+# Append-only journal of consumed question ids, one per line.
+# Recording an episode is a single appended write + fsync.
+# Replaying the lines in order through QuestionBank.consume
+# rebuilds the used set, including cycle resets. All writers
+# (append, compact) hold an flock on a sidecar lock file, so
+# several worker processes can share one log.
+# =========================================================
+class UsageLog:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(f"{self.path.name}.lock")
+
+    @contextmanager
+    def locked(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def identity(self):
+        """Changes when the log is compacted (replaced)."""
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_dev, st.st_ino
+
+    def read(self, offset: int = 0) -> Tuple[List[str], int]:
+        """
+        Ids appended at or after byte `offset`, and the new offset.
+        An unterminated last line is left for the next read; once the
+        next append has terminated it, a torn line that does not parse
+        is skipped (one that does is an unknown id, which consume
+        ignores).
+        """
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], 0
+
+        end = data.rfind(b"\n") + 1
+        ids = []
+        for raw in data[:end].split(b"\n"):
+            qid = _parse(raw)
+            if qid:
+                ids.append(qid)
+        return ids, offset + end
+
+    def append(self, ids: Iterable[str]):
+        """Caller holds locked()."""
+        data = "".join(f"{qid}\n" for qid in ids).encode("utf-8")
+        if not data:
+            return
+        fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            # a writer that crashed mid-line left no newline: terminate
+            # its torn line instead of gluing our first id onto it
+            size = os.fstat(fd).st_size
+            if size and os.pread(fd, 1, size - 1) != b"\n":
+                data = b"\n" + data
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def rewrite(self, ids: Iterable[str]):
+        """
+        Replace the log with `ids` (tmp + fsync + rename).
+        Caller holds locked().
+        """
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(f"{qid}\n" for qid in ids)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+
+def _parse(raw: bytes) -> Optional[str]:
+    try:
+        qid = raw.decode("utf-8").strip()
+    except UnicodeDecodeError:
+        return None
+    if "\x00" in qid:  # zero-filled tail after a crash
+        return None
+    return qid
+
+
+def should_compact(lines: int, live: int) -> bool:
+    """True once the log holds far more lines than live entries."""
+    return lines > max(COMPACT_MIN_LINES, 4 * live)
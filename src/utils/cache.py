@@ -0,0 +1,45 @@
+import os
+from pathlib import Path
+
+
+def evict_lru(root, max_bytes: int, suffix: str = ""):
+    """
+    Trim a cache directory to max_bytes, oldest mtime first.
+    Cache hits should os.utime() their file to count as recent.
+    """
+    root = Path(root)
+    if not root.is_dir():
+        return
+
+    entries = []
+    total = 0
+    for f in root.rglob(f"*{suffix}"):
+        try:
+            st = f.stat()
+        except FileNotFoundError:
+            continue
+        if not f.is_file():
+            continue
+        entries.append((st.st_mtime, st.st_size, f))
+        total += st.st_size
+
+    if total <= max_bytes:
+        return
+
+    entries.sort()
+    for _, size, f in entries:
+        if total <= max_bytes:
+            break
+        try:
+            f.unlink()
+            total -= size
+        except FileNotFoundError:
+            pass
+
+
+def touch(path) -> bool:
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
@@ -0,0 +1,17 @@
+import sqlite3
+from pathlib import Path
+
+from ..config import STATE_DB
+
+
+def connect(path: str = STATE_DB) -> sqlite3.Connection:
+    """
+    Local state database shared by the long-running workers.
+    WAL lets one process write while others read.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
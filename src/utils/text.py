@@ -1,6 +1,8 @@
 import textwrap
+from functools import lru_cache
 
 
+@lru_cache(maxsize=4096)
 def wrap_lines(text: str, width: int) -> str:
     return "\n".join(textwrap.wrap(text, width=width))
 
@@ -1,40 +1,123 @@
+import json
 import os
-import time
-import random
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from googleapiclient.errors import HttpError
 from typing import Optional
 
 from .config import (
+    CACHE_DIR,
     YOUTUBE_CLIENT_ID,
     YOUTUBE_CLIENT_SECRET,
     YOUTUBE_REFRESH_TOKEN,
     YOUTUBE_CHANNEL_ID,
 )
+from .resumable_upload import ResumableUpload, UploadLimitExceeded
 
 SCOPES = ["https://www.googleapis.com/auth/youtube.upload"]
 
+TOKEN_PATH = Path(CACHE_DIR) / "youtube_token.json"
+TOKEN_MARGIN = timedelta(minutes=5)  # refresh a little before expiry
+
+_lock = threading.Lock()
+_creds: Optional["PersistedCredentials"] = None
+_client = None
+
+
+# =========================================================
+# CREDENTIALS / CLIENT
+# One Credentials object and one built service per process.
+# The access token is persisted with its expiry, so a fresh
+# process only hits the token endpoint once the token is
+# actually stale.
+# =========================================================
+def _load_token() -> tuple:
+    try:
+        data = json.loads(TOKEN_PATH.read_text())
+        return data["token"], datetime.fromisoformat(data["expiry"])
+    except (FileNotFoundError, KeyError, ValueError):
+        return None, None
+
+
+def _save_token(creds: Credentials):
+    if not creds.token or not creds.expiry:
+        return
+    TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = TOKEN_PATH.with_name(f"{TOKEN_PATH.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump({"token": creds.token, "expiry": creds.expiry.isoformat()}, f)
+    os.replace(tmp, TOKEN_PATH)
+
+
+class PersistedCredentials(Credentials):
+    """
+    Saves the token after every refresh, including the ones the
+    API client does on its own when a request comes back 401.
+    """
+
+    def refresh(self, request):
+        super().refresh(request)
+        _save_token(self)
+
+
+def _stale(creds: Credentials) -> bool:
+    # google-auth keeps expiry as naive UTC
+    return (
+        not creds.token
+        or creds.expiry is None
+        or creds.expiry - TOKEN_MARGIN <= datetime.utcnow()
+    )
+
+
+def get_credentials() -> Credentials:
+    global _creds
+    with _lock:
+        if _creds is None:
+            token, expiry = _load_token()
+            _creds = PersistedCredentials(
+                token,
+                refresh_token=YOUTUBE_REFRESH_TOKEN,
+                token_uri="https://oauth2.googleapis.com/token",
+                client_id=YOUTUBE_CLIENT_ID,
+                client_secret=YOUTUBE_CLIENT_SECRET,
+                scopes=SCOPES,
+                expiry=expiry,
+            )
+
+        if _stale(_creds):
+            print("[youtube] Refreshing access token")
+            _creds.refresh(Request())
+
+        return _creds
+
 
 def get_youtube_client():
-    creds = Credentials(
-        None,
-        refresh_token=YOUTUBE_REFRESH_TOKEN,
-        token_uri="https://oauth2.googleapis.com/token",
-        client_id=YOUTUBE_CLIENT_ID,
-        client_secret=YOUTUBE_CLIENT_SECRET,
-        scopes=SCOPES,
-    )
+    global _client
+    creds = get_credentials()
+    with _lock:
+        if _client is None:
+            # bundled discovery document: no fetch/parse per process
+            _client = build(
+                "youtube",
+                "v3",
+                credentials=creds,
+                static_discovery=True,
+                cache_discovery=False,
+            )
+        return _client
 
-    return build("youtube", "v3", credentials=creds)
+
+def access_token() -> str:
+    return get_credentials().token
 
 
 def upload_short(
     video_path: str, title: str, description: str, max_retries: int = 6
 ) -> Optional[str]:
-    youtube = get_youtube_client()
-
     body = {
         "snippet": {
             "title": title[:100],
@@ -50,78 +133,26 @@ def upload_short(
     if not os.path.isfile(video_path):
         raise FileNotFoundError(video_path)
 
-    media = MediaFileUpload(
+    upload = ResumableUpload(
         video_path,
-        chunksize=-1,
-        resumable=True,
-        mimetype="video/mp4",
-    )
-
-    request = youtube.videos().insert(
-        part="snippet,status",
-        body=body,
-        media_body=media,
+        body,
+        auth=access_token,
+        max_retries=max_retries,
     )
 
-    response = None
-    attempt = 0
-
-    while response is None:
-        try:
-            status, response = request.next_chunk()
-            if status:
-                print(f"[youtube] Upload {int(status.progress() * 100)}%")
-
-        except HttpError as e:
-            # Try to detect "uploadLimitExceeded"
-            reason = ""
-
-            try:
-                data = e.error_details if hasattr(e, "error_details") else None
-                if not data:
-                    import json
-
-                    payload = json.loads(e.content.decode("utf-8"))
-                    reason = payload["error"]["errors"][0].get("reason", "")
-                else:
-                    reason = str(data)
-            except Exception:
-                reason = ""
-
-            if "uploadLimitExceeded" in str(e) or "uploadLimitExceeded" in reason:
-                print("[youtube] ❗ uploadLimitExceeded → auto-skip upload")
-                return None  # ✅ SKIP
-
-            attempt += 1
-            if attempt > max_retries:
-                raise
-
-            sleep_s = min(60, (2**attempt) + random.uniform(0.2, 1.5))
-            print(
-                f"[youtube] Upload chunk failed (attempt {attempt}/{max_retries}): {e}"
-            )
-            print(f"[youtube] Retrying in {sleep_s:.1f}s...")
-            time.sleep(sleep_s)
-
-        except Exception as e:
-            attempt += 1
-            if attempt > max_retries:
-                raise
-
-            sleep_s = min(60, (2**attempt) + random.uniform(0.2, 1.5))
-            print(
-                f"[youtube] Upload chunk failed (attempt {attempt}/{max_retries}): {e}"
-            )
-            print(f"[youtube] Retrying in {sleep_s:.1f}s...")
-            time.sleep(sleep_s)
+    try:
+        response = upload.run()
+    except UploadLimitExceeded:
+        print("[youtube] ❗ uploadLimitExceeded → auto-skip upload")
+        return None  # ✅ SKIP
 
     vid = response["id"]
     print("[youtube] Upload complete:", vid)
     return vid
 
 
-def post_comment(video_id: str, text: str) -> str:
-    youtube = get_youtube_client()
+def post_comment(video_id: str, text: str, youtube=None) -> str:
+    youtube = youtube or get_youtube_client()
 
     res = (
         youtube.commentThreads()
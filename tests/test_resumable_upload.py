@@ -0,0 +1,200 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src import resumable_upload
+from src.resumable_upload import (
+    CHUNK_ALIGN,
+    ResumableUpload,
+    UploadLimitExceeded,
+    chunk_bytes,
+)
+
+LIMIT_EXCEEDED = json.dumps(
+    {"error": {"code": 403, "errors": [{"reason": "uploadLimitExceeded"}]}}
+).encode()
+
+
+# =========================================================
+# FAKE UPLOAD ENDPOINT
+# Just enough of the resumable protocol: POST opens a
+# session, PUT appends a chunk (308 + Range until complete),
+# PUT "bytes */N" reports progress. `fail` holds status codes
+# (or (status, body) pairs) to answer the next chunk PUTs with;
+# `keep` truncates what the server stores of the next chunk.
+# =========================================================
+class FakeServer:
+    def __init__(self):
+        self.data = bytearray()
+        self.total = None
+        self.posts = 0
+        self.queries = 0
+        self.ranges = []
+        self.fail = []
+        self.keep = []
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/upload"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, headers=None, body=b""):
+                self.send_response(status)
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _progress(self):
+                if len(server.data) == server.total:
+                    body = json.dumps({"id": "vid123"}).encode()
+                    return self._reply(200, body=body)
+                headers = {}
+                if server.data:
+                    headers["Range"] = f"bytes=0-{len(server.data) - 1}"
+                self._reply(308, headers)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                server.posts += 1
+                server.total = int(self.headers["X-Upload-Content-Length"])
+                server.data.clear()
+                self._reply(200, {"Location": f"{server.url}?session=1"})
+
+            def do_PUT(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                rng = self.headers["Content-Range"]
+                if rng.startswith("bytes */"):
+                    server.queries += 1
+                    return self._progress()
+
+                server.ranges.append(rng)
+                if server.fail:
+                    status = server.fail.pop(0)
+                    if isinstance(status, tuple):
+                        return self._reply(status[0], body=status[1])
+                    return self._reply(status)
+
+                start = int(re.match(r"bytes (\d+)-", rng).group(1))
+                assert start == len(server.data), "chunk does not continue the upload"
+                if server.keep:
+                    body = body[: server.keep.pop(0)]
+                server.data.extend(body)
+                self._progress()
+
+        return Handler
+
+
+@pytest.fixture
+def server():
+    s = FakeServer()
+    yield s
+    s.close()
+
+
+@pytest.fixture
+def video(tmp_path, monkeypatch):
+    monkeypatch.setattr(resumable_upload, "UPLOAD_STATE_DIR", tmp_path / "uploads")
+    monkeypatch.setattr(resumable_upload.time, "sleep", lambda s: None)
+    path = tmp_path / "episode.mp4"
+    path.write_bytes(bytes(range(256)) * (CHUNK_ALIGN * 5 // 2 // 256))
+    return path
+
+
+def _upload(server, video, **kwargs):
+    return ResumableUpload(
+        str(video),
+        {"snippet": {}},
+        lambda: "token",
+        endpoint=server.url,
+        chunk_size=CHUNK_ALIGN,
+        **kwargs,
+    )
+
+
+def test_next_offset():
+    assert resumable_upload._next_offset({"Range": "bytes=0-1048575"}) == 1048576
+    assert resumable_upload._next_offset({}) == 0
+
+
+def test_chunk_bytes_aligned():
+    assert chunk_bytes(1) == 4 * CHUNK_ALIGN
+    assert chunk_bytes(0.3) == CHUNK_ALIGN
+    assert chunk_bytes(0.01) == CHUNK_ALIGN
+
+
+def test_uploads_in_chunks(server, video):
+    up = _upload(server, video)
+    assert up.run() == {"id": "vid123"}
+
+    size = video.stat().st_size
+    assert bytes(server.data) == video.read_bytes()
+    assert server.ranges == [
+        f"bytes 0-{CHUNK_ALIGN - 1}/{size}",
+        f"bytes {CHUNK_ALIGN}-{2 * CHUNK_ALIGN - 1}/{size}",
+        f"bytes {2 * CHUNK_ALIGN}-{size - 1}/{size}",
+    ]
+    assert not up.state_file.exists()
+
+
+def test_resends_what_the_server_did_not_keep(server, video):
+    server.keep = [1000]
+    _upload(server, video).run()
+
+    assert bytes(server.data) == video.read_bytes()
+    assert server.ranges[1].startswith("bytes 1000-")
+
+
+def test_resumes_after_server_error(server, video):
+    server.fail = [503]
+    _upload(server, video).run()
+
+    assert bytes(server.data) == video.read_bytes()
+    assert server.posts == 1      # same session, not a new upload
+    assert server.queries == 1    # asked where to continue
+
+
+def test_new_process_continues_saved_session(server, video):
+    first = _upload(server, video, max_retries=0)
+    orig = first.send_chunk
+    calls = []
+
+    def crash_after_first(session, f, offset):
+        if calls:
+            raise OSError("connection reset")
+        calls.append(offset)
+        return orig(session, f, offset)
+
+    first.send_chunk = crash_after_first
+    with pytest.raises(OSError):
+        first.run()
+
+    state = json.loads(first.state_file.read_text())
+    assert state["offset"] == CHUNK_ALIGN
+
+    assert _upload(server, video).run() == {"id": "vid123"}
+    assert bytes(server.data) == video.read_bytes()
+    assert server.posts == 1
+
+
+def test_upload_limit_on_chunk_is_not_retried(server, video):
+    server.fail = [(403, LIMIT_EXCEEDED)]
+
+    with pytest.raises(UploadLimitExceeded):
+        _upload(server, video).run()
+    assert len(server.ranges) == 1
@@ -0,0 +1,118 @@
+import json
+
+import pytest
+
+from src import question_bank
+from src.question_store import sqlite_store
+from src.question_store.sqlite_store import SqliteQuestionStore
+
+COOLDOWN = 100
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(sqlite_store, "time", c)
+    return c
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    monkeypatch.setattr(question_bank, "INDEX_PATH", tmp_path / "questions.idx")
+    path = tmp_path / "questions.json"
+    write_source(path, ["a", "b"])
+    return path
+
+
+def write_source(path, ids):
+    path.write_text(
+        json.dumps(
+            [{"id": qid, "question": f"{qid}?", "difficulty": "easy"} for qid in ids]
+        )
+    )
+
+
+def open_store(tmp_path, source, used_ids=()):
+    return SqliteQuestionStore(
+        tmp_path / "questions.db", COOLDOWN, source=source, used_ids=used_ids
+    )
+
+
+def pick(store, n=1):
+    with store.session():
+        return [store.pick("easy")["id"] for _ in range(n)]
+
+
+def usage(store):
+    rows = store.conn.execute("SELECT id, last_used, use_count FROM questions")
+    return {r["id"]: (r["last_used"], r["use_count"]) for r in rows}
+
+
+def test_pick_marks_question_used(tmp_path, source, clock):
+    store = open_store(tmp_path, source)
+    [qid] = pick(store)
+
+    assert usage(store)[qid] == (clock.now, 1)
+
+
+def test_cooldown_keeps_question_out_until_cutoff(tmp_path, source, clock):
+    store = open_store(tmp_path, source)
+    [first] = pick(store)
+
+    clock.now += 10
+    [second] = pick(store)
+    assert second != first
+
+    # first's cooldown has run out, second's has not
+    clock.now += COOLDOWN - 10
+    assert pick(store) == [first]
+
+
+def test_falls_back_to_least_recently_used(tmp_path, source, clock):
+    store = open_store(tmp_path, source)
+    [first] = pick(store)
+    clock.now += 10
+    pick(store)
+
+    clock.now += 10  # both cooling down
+    assert pick(store) == [first]
+
+
+def test_exception_in_session_rolls_back(tmp_path, source, clock):
+    store = open_store(tmp_path, source)
+
+    with pytest.raises(RuntimeError):
+        with store.session():
+            store.pick("easy")
+            raise RuntimeError("render failed")
+
+    assert all(last_used is None for last_used, _ in usage(store).values())
+
+
+def test_first_import_seeds_used_ids(tmp_path, source, clock):
+    store = open_store(tmp_path, source, used_ids=["a"])
+
+    assert pick(store) == ["b"]
+    assert usage(store)["a"][1] == 1
+
+
+def test_questions_removed_from_source_are_dropped(tmp_path, source, clock):
+    store = open_store(tmp_path, source)
+    pick(store)
+
+    write_source(source, ["a"])
+    picked = set()
+    for _ in range(20):
+        clock.now += COOLDOWN + 1
+        picked.update(pick(store))
+
+    assert picked == {"a"}
+    assert set(usage(store)) == {"a"}